@@ -0,0 +1,122 @@
+import math
+import time
+from collections import deque
+
+# Canvas animations that reuse a fixed set of items instead of creating new ones every frame
+
+
+# Calls on_frame(frame) for frames 0 .. frames-1, one every frame_ms, from Tk's event loop
+# Frames are timed from the start, so if a frame runs late the ones that are already overdue are dropped
+# and the animation still ends on time
+class FrameScheduler:
+    def __init__(self, widget, frame_ms, frames, on_frame, clock=time.perf_counter_ns):
+        # widget is any Tk widget, used for after() / after_cancel()
+        self.widget = widget
+        self.frame_ns = frame_ms * 1_000_000
+        self.frames = frames
+        self.on_frame = on_frame
+        self.clock = clock
+        self.start_ns = None
+        self.after_id = None
+        # Last frame drawn, frames drawn and frames dropped since start()
+        self.frame = -1
+        self.drawn = 0
+        self.dropped = 0
+        # Time taken by on_frame for the most recent frames, in nanoseconds
+        self.frame_times = deque(maxlen=120)
+
+    @property
+    def running(self):
+        return self.after_id is not None
+
+    def start(self):
+        self.cancel()
+        self.start_ns = self.clock()
+        self.frame = -1
+        self.drawn = 0
+        self.dropped = 0
+        self.frame_times.clear()
+        self.after_id = self.widget.after_idle(self.tick)
+
+    def cancel(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    def tick(self):
+        self.after_id = None
+        # Drawing the frame that is due now, skipping any that were missed; the last frame is always drawn
+        due = min((self.clock() - self.start_ns) // self.frame_ns, self.frames - 1)
+        if due <= self.frame:
+            due = self.frame + 1
+        self.dropped += due - self.frame - 1
+        self.frame = due
+        start = self.clock()
+        self.on_frame(due)
+        end = self.clock()
+        self.frame_times.append(end - start)
+        self.drawn += 1
+        if due < self.frames - 1:
+            # Waking up when the next frame is due
+            wait_ns = self.start_ns + (due + 1) * self.frame_ns - end
+            self.after_id = self.widget.after(max(0, wait_ns // 1_000_000), self.tick)
+
+    # Drawn and dropped frames, and the average and slowest frame in milliseconds
+    def stats(self):
+        times = self.frame_times
+        return {"drawn": self.drawn, "dropped": self.dropped,
+                "average_ms": sum(times) / len(times) / 1e6 if times else 0.0,
+                "max_ms": max(times) / 1e6 if times else 0.0}
+
+
+# Game over explosion: rings that grow from (x, y) with spikes around them and "BOOM!" on top
+# Every ring, spike and the text are made once, and each frame only moves them
+class Explosion:
+    # Rings as (distance outside the radius, outline color)
+    rings = ((0, "white"), (5, "yellow"), (10, "red"), (15, "white"))
+    spikes = 12
+
+    def __init__(self, canvas, x, y, font, frame_ms=20, start_radius=10, end_radius=800, step=20):
+        self.canvas = canvas
+        self.x = x
+        self.y = y
+        self.start_radius = start_radius
+        self.step = step
+        frames = (end_radius - start_radius + step - 1) // step
+
+        self.ring_items = [canvas.create_oval(x, y, x, y, outline=color, width=5, state="hidden")
+                           for _, color in self.rings]
+        self.spike_items = [canvas.create_polygon(x, y, x, y, x, y, x, y, fill="yellow", outline="white",
+                                                  width=3, state="hidden") for _ in range(self.spikes)]
+        self.text_item = canvas.create_text(x, y, text="BOOM!", font=font, fill="black", state="hidden")
+        # Where each spike points, worked out once
+        self.directions = [(math.cos(math.radians(i * 360 / self.spikes)), math.sin(math.radians(i * 360 / self.spikes)))
+                           for i in range(self.spikes)]
+        self.scheduler = FrameScheduler(canvas, frame_ms, frames, self.draw)
+
+    def start(self):
+        self.scheduler.start()
+
+    def stop(self):
+        self.scheduler.cancel()
+
+    # Number of items on the canvas, which stays the same however long the animation runs
+    @property
+    def item_count(self):
+        return len(self.canvas.find_all())
+
+    def draw(self, frame):
+        canvas = self.canvas
+        x, y = self.x, self.y
+        r = self.start_radius + frame * self.step
+        for item, (extra, _) in zip(self.ring_items, self.rings):
+            canvas.coords(item, x-r-extra, y-r-extra, x+r+extra, y+r+extra)
+        for item, (dx, dy) in zip(self.spike_items, self.directions):
+            cx = x + (r-30) * dx
+            cy = y - (r-30) * dy
+            canvas.coords(item, x, y, cx-15, cy-15, cx, cy, cx+15, cy-15)
+        # Showing everything on the first frame drawn, which is not frame 0 if that one was dropped
+        if self.scheduler.drawn == 0:
+            for item in self.ring_items + self.spike_items + [self.text_item]:
+                canvas.itemconfigure(item, state="normal")
+            canvas.tag_raise(self.text_item)
@@ -0,0 +1,86 @@
+# Compares the batched adjacency count against the nested loop place_mines() used to run
+# Usage: python benchmarks/bench_adjacency.py
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+
+sizes = [
+    ("Easy", 9, 9, 10),
+    ("Medium", 16, 16, 40),
+    ("Hard", 16, 30, 99),
+    ("1k x 1k", 1000, 1000, 206250),
+]
+
+
+# The original per-cell loop, working on a list of lists holding "X" and ints
+def nested_loop_counts(board, rows, cols):
+    for row in range(rows):
+        for col in range(cols):
+            if board[row][col] != "X":
+                num_mines = 0
+                for r in range(max(0, row-1), min(rows, row+2)):
+                    for c in range(max(0, col-1), min(cols, col+2)):
+                        if board[r][c] == "X":
+                            num_mines += 1
+                board[row][col] = num_mines
+    return board
+
+
+# Runs a function enough times to take at least 0.2 seconds and returns the best time per call
+def best_time(function, min_total=0.2):
+    best = float("inf")
+    total = 0.0
+    runs = 0
+    while total < min_total or runs < 3:
+        start = time.perf_counter()
+        function()
+        taken = time.perf_counter() - start
+        best = min(best, taken)
+        total += taken
+        runs += 1
+    return best
+
+
+def main():
+    rng = random.Random(1201)
+    print(f"numpy available: {engine.np is not None}")
+    print(f"{'board':<10}{'nested loop':>14}{'python':>12}{'numpy':>12}{'speedup':>10}")
+    for name, rows, cols, mines in sizes:
+        mine = bytearray(rows * cols)
+        for i in rng.sample(range(rows * cols), mines):
+            mine[i] = 1
+
+        # Mines stay "X" after the loop runs, so the same board can be timed again
+        board = [["X" if mine[r * cols + c] else 0 for c in range(cols)] for r in range(rows)]
+
+        def legacy():
+            return nested_loop_counts(board, rows, cols)
+
+        # Checking that every path gives the same numbers as the old loop
+        expected = legacy()
+        counts = engine._adjacency_counts_python(mine, rows, cols)
+        for i in range(rows * cols):
+            if not mine[i]:
+                assert counts[i] == expected[i // cols][i % cols]
+        if engine.np is not None:
+            assert engine._adjacency_counts_numpy(mine, rows, cols) == counts
+
+        legacy_time = best_time(legacy)
+        python_time = best_time(lambda: engine._adjacency_counts_python(mine, rows, cols))
+        if engine.np is not None:
+            numpy_time = best_time(lambda: engine._adjacency_counts_numpy(mine, rows, cols))
+            numpy_text = f"{numpy_time * 1000:>10.3f}ms"
+        else:
+            numpy_time = python_time
+            numpy_text = f"{'-':>12}"
+        fastest = min(python_time, numpy_time)
+        print(f"{name:<10}{legacy_time * 1000:>12.3f}ms{python_time * 1000:>10.3f}ms{numpy_text}{legacy_time / fastest:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# Times a large cascade reveal from the click to the finished repaint
+# Compares two config() calls per revealed Button with the batched canvas update
+# Needs a display (run under Xvfb on a headless machine)
+# Usage: python benchmarks/bench_cascade.py [rows] [cols]
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+import renderer
+
+clicked_cell_color = "#F3DEBA"
+
+
+# Builds a board with very few mines and opens it from the middle, returning the revealed cells
+def cascade(rows, cols):
+    board = engine.Board(rows, cols, 5, seed=1201)
+    board.place_mines(rows // 2, cols // 2)
+    start = time.perf_counter()
+    opened = board.reveal_cells(rows // 2, cols // 2)
+    return board, opened, time.perf_counter() - start
+
+
+def time_buttons(root, board, opened):
+    frame = tk.Frame(root)
+    frame.pack()
+    buttons = []
+    for row in range(board.rows):
+        for col in range(board.cols):
+            button = tk.Button(frame, text="", width=1, height=1)
+            button.grid(row=row, column=col)
+            buttons.append(button)
+    root.update()
+
+    start = time.perf_counter()
+    for i in opened:
+        value = board.value(*board.position(i))
+        buttons[i].config(text=value, bg=clicked_cell_color, fg="#424242")
+        buttons[i].config(relief=tk.SUNKEN)
+    root.update()
+    taken = time.perf_counter() - start
+    frame.destroy()
+    return taken
+
+
+def time_canvas(root, board, opened):
+    frame = tk.Frame(root)
+    frame.pack()
+    board_view = renderer.BoardCanvas(frame, board.rows, board.cols, "TkDefaultFont", "#a8dba8", "#c1ffc1", "#ABC4AA", cell_size=10)
+    board_view.pack()
+    root.update()
+
+    start = time.perf_counter()
+    for i in opened:
+        value = board.value(*board.position(i))
+        board_view.draw_cell(i, value, clicked_cell_color, "#424242")
+    root.update()
+    taken = time.perf_counter() - start
+    frame.destroy()
+    return taken
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else rows
+    board, opened, engine_time = cascade(rows, cols)
+    root = tk.Tk()
+    buttons_time = time_buttons(root, board, opened)
+    canvas_time = time_canvas(root, board, opened)
+    root.destroy()
+
+    print(f"{rows}x{cols} board, cascade opens {len(opened)} cells")
+    print(f"engine reveal:           {engine_time * 1000:10.1f}ms")
+    print(f"buttons, config per cell:{buttons_time * 1000:10.1f}ms")
+    print(f"canvas, batched update:  {canvas_time * 1000:10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Runs the game over explosion and reports canvas items and time per frame, against the old animation
+# that created new items every frame; also runs it with a slow frame to show late frames being dropped
+# Needs a display (run under Xvfb on a headless machine)
+# Usage: python benchmarks/bench_explosion.py
+import math
+import os
+import sys
+import time
+import tkinter as tk
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import animation
+
+
+# The explosion game_over() used to run, which added 21 items every frame and never removed any
+def old_explosion(canvas, x, y, r, frame_times):
+    start = time.perf_counter_ns()
+    canvas.create_text(100, 100, text="BOOM!", font=("Impact", 50), fill="black")
+    if r < 800:
+        explosion_colors = ["orange", "yellow", "red", "white"]
+        for i in range(4):
+            canvas.create_oval(x-r, y-r, x+r, y+r, outline=explosion_colors[i], width=5)
+            canvas.create_oval(x-r-i*5, y-r-i*5, x+r+i*5, y+r+i*5, outline=explosion_colors[i], width=5)
+        for i in range(12):
+            angle = math.radians(i*30)
+            cx = x + (r-30) * math.cos(angle)
+            cy = y - (r-30) * math.sin(angle)
+            canvas.create_polygon(x, y, cx-15, cy-15, cx, cy, cx+15, cy-15, fill="yellow", outline="white", width=3)
+        frame_times.append(time.perf_counter_ns() - start)
+        canvas.after(20, old_explosion, canvas, x, y, r+20, frame_times)
+
+
+# Keeps Tk running until check() is true, calling sample() after every pass through the event loop
+def run_until(root, check, sample=lambda: None):
+    while not check():
+        root.update()
+        sample()
+        time.sleep(0.001)
+
+
+def main():
+    root = tk.Tk()
+    canvas = tk.Canvas(root, width=800, height=200)
+    canvas.pack()
+
+    frame_times = []
+    old_explosion(canvas, 100, 100, 10, frame_times)
+    run_until(root, lambda: len(frame_times) >= 40)
+    root.update()
+    old_items = len(canvas.find_all())
+    print(f"old:    {old_items:4d} items after {len(frame_times)} frames, "
+          f"first frame {frame_times[0] / 1e3:.0f}us, last frame {frame_times[-1] / 1e3:.0f}us")
+    canvas.delete("all")
+
+    explosion = animation.Explosion(canvas, 100, 100, ("Impact", 50))
+    counts = set()
+    explosion.start()
+    run_until(root, lambda: not explosion.scheduler.running, lambda: counts.add(explosion.item_count))
+    stats = explosion.scheduler.stats()
+    print(f"pooled: {max(counts):4d} items at most (counts seen: {sorted(counts)}), {stats['drawn']} frames drawn, "
+          f"{stats['dropped']} dropped, {stats['average_ms'] * 1000:.0f}us average, {stats['max_ms'] * 1000:.0f}us slowest")
+
+    # A frame that takes 100ms: the frames that fall due meanwhile are dropped and the animation still ends on time
+    draw = explosion.draw
+    def slow_draw(frame):
+        draw(frame)
+        if frame == 5:
+            time.sleep(0.1)
+    explosion.scheduler.on_frame = slow_draw
+    start = time.perf_counter()
+    explosion.start()
+    run_until(root, lambda: not explosion.scheduler.running)
+    stats = explosion.scheduler.stats()
+    print(f"slow:   {stats['drawn']} frames drawn, {stats['dropped']} dropped, "
+          f"finished in {(time.perf_counter() - start) * 1000:.0f}ms (40 frames of 20ms = 800ms)")
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
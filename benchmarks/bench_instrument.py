@@ -0,0 +1,49 @@
+# Measures what the opt-in instrumentation costs: the same simulated games are played with it off and on,
+# and the timings it collected are printed
+# Usage: python benchmarks/bench_instrument.py [games] [difficulty]
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+import instrument
+import simulate
+
+
+def play_ms(games, rows, cols, mines):
+    start = time.perf_counter()
+    simulate.run_games(0, games, 2020, rows, cols, mines, "play")
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    difficulty = sys.argv[2] if len(sys.argv) > 2 else "Medium"
+    rows, cols, mines = engine.difficulties[difficulty]
+
+    off = min(play_ms(games, rows, cols, mines) for _ in range(3))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "report.json")
+        instrument.install(path, write_at_exit=False)
+        on = min(play_ms(games, rows, cols, mines) for _ in range(3))
+        instrument.write_report(path)
+        with open(path) as file:
+            report = json.load(file)
+
+    print(f"{games} {difficulty} games")
+    print(f"instrumentation off: {off:8.1f}ms")
+    print(f"instrumentation on:  {on:8.1f}ms ({on / off - 1:+.1%})")
+    print(f"{'function':<26}{'calls':>9}{'p50':>10}{'p99':>10}{'max':>10}")
+    for label, summary in report["timings"].items():
+        print(f"{label:<26}{summary['count']:>9}{summary['p50_us']:>8.1f}us{summary['p99_us']:>8.1f}us"
+              f"{summary['max_us']:>8.1f}us")
+    for label, value in report["counters"].items():
+        print(f"{label:<26}{value:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# Compares top-5 lookups from the SQLite leaderboard with the old read-and-sort of leaderboard.txt
+# Usage: python benchmarks/bench_leaderboard.py [entries]
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import leaderboard
+
+difficulties = ["Easy", "Medium", "Hard"]
+
+
+# The old get_top_times(): read every line, keep the matching difficulty and sort
+def text_top_times(path, difficulty):
+    times = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith(difficulty):
+                _, name, time_taken = line.split(",")
+                times.append((float(time_taken), name))
+    return sorted(times)[:5]
+
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(1201)
+    results = [(rng.choice(difficulties), f"player{rng.randrange(1000)}", rng.uniform(5, 1000)) for _ in range(entries)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        text_path = os.path.join(directory, "leaderboard.txt")
+        with open(text_path, "w") as f:
+            for difficulty, name, time_taken in results:
+                f.write(f"{difficulty},{name},{time_taken}\n")
+
+        start = time.perf_counter()
+        scores = leaderboard.Leaderboard(os.path.join(directory, "leaderboard.db"), text_path)
+        import_time = time.perf_counter() - start
+
+        print(f"{entries} entries, import took {import_time:.2f}s")
+        print(f"{'difficulty':<12}{'text file':>12}{'sqlite':>12}{'speedup':>10}")
+        for difficulty in difficulties:
+            start = time.perf_counter()
+            expected = text_top_times(text_path, difficulty)
+            text_time = time.perf_counter() - start
+
+            runs = 1000
+            start = time.perf_counter()
+            for _ in range(runs):
+                got = scores.top_times(difficulty, 5)
+            sqlite_time = (time.perf_counter() - start) / runs
+
+            assert [t for t, _ in got] == [t for t, _ in expected]
+            print(f"{difficulty:<12}{text_time * 1000:>10.1f}ms{sqlite_time * 1000:>10.3f}ms{text_time / sqlite_time:>9.0f}x")
+        scores.close()
+
+
+if __name__ == "__main__":
+    main()
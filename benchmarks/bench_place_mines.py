@@ -0,0 +1,55 @@
+# Compares sampling mine placement against the old retry loop at increasing mine densities
+# Usage: python benchmarks/bench_place_mines.py
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+
+rows = 16
+cols = 30
+densities = [0.10, 0.20, 0.40, 0.60, 0.80, 0.90, 0.95]
+games = 200
+
+
+# The original retry loop: draw random cells until enough of them are free and outside the safe zone
+def retry_loop(rows, cols, mines, click_row, click_col, rng):
+    board = [[0] * cols for _ in range(rows)]
+    count = 0
+    while count < mines:
+        row = rng.randint(0, rows - 1)
+        col = rng.randint(0, cols - 1)
+        if (board[row][col] != "X") and ((abs(row - click_row) > 1) or (abs(col - click_col) > 1)):
+            board[row][col] = "X"
+            count += 1
+    return board
+
+
+def main():
+    click_row, click_col = rows // 2, cols // 2
+    print(f"{rows}x{cols} board, {games} games per density")
+    print(f"{'density':<10}{'mines':>6}{'retry loop':>14}{'sampling':>12}{'speedup':>10}")
+    for density in densities:
+        mines = min(int(rows * cols * density), rows * cols - 9)
+
+        rng = random.Random(1201)
+        start = time.perf_counter()
+        for _ in range(games):
+            retry_loop(rows, cols, mines, click_row, click_col, rng)
+        retry_time = (time.perf_counter() - start) / games
+
+        # Timing mine placement only, without the adjacency counts that place_mines() also works out
+        board = engine.Board(rows, cols, mines, seed=1201)
+        start = time.perf_counter()
+        for _ in range(games):
+            board.sample_mines(click_row, click_col)
+        sample_time = (time.perf_counter() - start) / games
+
+        print(f"{density:<10.0%}{mines:>6}{retry_time * 1000:>12.3f}ms{sample_time * 1000:>10.3f}ms{retry_time / sample_time:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# Times the hint probabilities after every move of solver-played Hard games
+# Compares recomputing with the group cache against counting every group from scratch
+# Usage: python benchmarks/bench_probability.py [games]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+import probability
+import solver
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    rows, cols, mines = engine.difficulties["Hard"]
+    cached_times = []
+    fresh_times = []
+    hits = misses = 0
+    for seed in range(games):
+        board = engine.Board(rows, cols, mines, seed=seed)
+        player = solver.Solver(board, seed=seed)
+        hints = probability.MineProbabilities(board)
+        player.open(board.index(rows // 2, cols // 2))
+        while not player.finished():
+            player.step()
+            if player.finished():
+                break
+            start = time.perf_counter()
+            hints.compute()
+            cached_times.append(time.perf_counter() - start)
+            hits += hints.hits
+            misses += hints.misses
+
+            start = time.perf_counter()
+            probability.MineProbabilities(board).compute()
+            fresh_times.append(time.perf_counter() - start)
+
+    print(f"{games} Hard games, {len(cached_times)} recomputes, group cache hit rate {hits / max(1, hits + misses):.0%}")
+    for name, times in (("cached", cached_times), ("from scratch", fresh_times)):
+        print(f"{name:<14} p50 {percentile(times, 0.5) * 1000:6.2f}ms  p99 {percentile(times, 0.99) * 1000:6.2f}ms  "
+              f"max {max(times) * 1000:6.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# Measures board build time and memory for one Button per cell against the single Canvas renderer
+# Needs a display (run under Xvfb on a headless machine)
+# Usage: python benchmarks/bench_render.py
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+sizes = [
+    ("Easy", 9, 9),
+    ("Medium", 16, 16),
+    ("Hard", 16, 30),
+    ("100x100", 100, 100),
+    ("200x200", 200, 200),
+]
+
+
+# Resident memory of this process in kB, read from /proc (Linux only)
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return 0
+
+
+# The widget-per-cell board create_board() used to build
+def build_buttons(frame, rows, cols):
+    import tkinter as tk
+    for row in range(rows):
+        for col in range(cols):
+            button = tk.Button(frame, text="", width=1, height=1, bg="#a8dba8", highlightbackground="#c1ffc1", relief=tk.RAISED)
+            button.grid(row=row, column=col, sticky=tk.NSEW)
+            button.bind("<Button-1>", lambda event: None)
+            button.bind("<Button-3>", lambda event: None)
+    for row in range(rows):
+        frame.grid_rowconfigure(row, weight=1)
+    for column in range(cols):
+        frame.grid_columnconfigure(column, weight=1)
+
+
+def build_canvas(frame, rows, cols):
+    import tkinter as tk
+    import renderer
+    board_view = renderer.BoardCanvas(frame, rows, cols, "TkDefaultFont", "#a8dba8", "#c1ffc1", "#ABC4AA")
+    board_view.bind_click(1, lambda row, col: None)
+    board_view.bind_click(3, lambda row, col: None)
+    board_view.pack(expand=True, fill=tk.BOTH)
+
+
+# Builds one board in this process and prints "seconds rss_kb"
+def measure(mode, rows, cols):
+    import tkinter as tk
+    root = tk.Tk()
+    frame = tk.Frame(root)
+    frame.pack(expand=True, fill=tk.BOTH)
+    root.update()
+    before = rss_kb()
+    start = time.perf_counter()
+    if mode == "buttons":
+        build_buttons(frame, rows, cols)
+    else:
+        build_canvas(frame, rows, cols)
+    root.update()
+    taken = time.perf_counter() - start
+    print(taken, rss_kb() - before)
+    root.destroy()
+
+
+def main():
+    print(f"{'board':<10}{'buttons':>12}{'canvas':>12}{'buttons RSS':>14}{'canvas RSS':>14}")
+    for name, rows, cols in sizes:
+        results = {}
+        for mode in ("buttons", "canvas"):
+            # Each build runs in a fresh process so memory from one does not count towards the other
+            output = subprocess.run([sys.executable, __file__, mode, str(rows), str(cols)],
+                                    capture_output=True, text=True, check=True).stdout.split()
+            results[mode] = (float(output[0]), int(output[1]))
+        print(f"{name:<10}{results['buttons'][0] * 1000:>10.1f}ms{results['canvas'][0] * 1000:>10.1f}ms"
+              f"{results['buttons'][1]:>11d} kB{results['canvas'][1]:>11d} kB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4:
+        measure(sys.argv[1], int(sys.argv[2]), int(sys.argv[3]))
+    else:
+        main()
@@ -0,0 +1,72 @@
+# Records solver games as replays, then reports their size and how fast a folder of them is checked
+# Usage: python benchmarks/bench_replay.py [replays] [workers]
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+import replay
+import solver
+
+
+# Board that records every move that changes something, with a made up time between moves
+class RecordingBoard(engine.Board):
+    __slots__ = ("recorder", "clock", "pace")
+
+    def left_click(self, row, col):
+        opened = super().left_click(row, col)
+        if opened:
+            self.clock += self.pace.uniform(0.1, 1.5)
+            self.recorder.record(self.index(row, col), "reveal", self.clock)
+        return opened
+
+    def right_click(self, row, col):
+        changed = super().right_click(row, col)
+        if changed:
+            self.clock += self.pace.uniform(0.1, 1.5)
+            self.recorder.record(self.index(row, col), "flag", self.clock)
+        return changed
+
+
+# Plays one game with the solver and returns (replay bytes, won)
+def record_game(name, rows, cols, mines, seed):
+    board = RecordingBoard(rows, cols, mines, seed=seed)
+    board.recorder = replay.Recorder(rows, cols, mines, mines, name, "bench", seed=seed)
+    board.clock = 0.0
+    board.pace = random.Random(seed)
+    won = solver.Solver(board, seed=seed).solve()
+    return board.recorder.finish(board.clock + 0.01), won
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (rows, cols, mines) in engine.difficulties.items():
+            sizes = []
+            won_sizes = []
+            for seed in range(count // 3):
+                data, won = record_game(name, rows, cols, mines, seed)
+                sizes.append(len(data))
+                if won:
+                    won_sizes.append(len(data))
+                with open(os.path.join(directory, f"{name}-{seed}.replay"), "wb") as file:
+                    file.write(data)
+            sizes.sort()
+            won_sizes.sort()
+            print(f"{name:<8} replay size p50 {sizes[len(sizes) // 2]}B, max {sizes[-1]}B, "
+                  f"won games p50 {won_sizes[len(won_sizes) // 2] if won_sizes else 0}B")
+
+        start = time.perf_counter()
+        results = list(replay.check_directory(directory, workers))
+        taken = time.perf_counter() - start
+        invalid = sum(not result["valid"] for result in results)
+        print(f"checked {len(results)} replays in {taken:.2f}s ({len(results) / taken:.0f}/s), {invalid} invalid")
+
+
+if __name__ == "__main__":
+    main()
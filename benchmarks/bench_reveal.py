@@ -0,0 +1,33 @@
+# Times a single click that opens almost all of a very large board
+# Usage: python benchmarks/bench_reveal.py [rows] [cols]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    cols = int(sys.argv[2]) if len(sys.argv) > 2 else rows
+    mines = 10
+
+    board = engine.Board(rows, cols, mines, seed=1201)
+    start = time.perf_counter()
+    board.place_mines(rows // 2, cols // 2)
+    place_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    opened = board.reveal_cells(rows // 2, cols // 2)
+    reveal_time = time.perf_counter() - start
+
+    print(f"{rows}x{cols} board with {mines} mines")
+    print(f"place_mines:  {place_time * 1000:10.1f}ms")
+    print(f"reveal_cells: {reveal_time * 1000:10.1f}ms for {len(opened)} cells "
+          f"({len(opened) / reveal_time / 1e6:.2f}M cells/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# Times save files on boards from 10 thousand to 10 million cells:
+# writing a new save, saving one move, opening a save (header only) and loading the whole board back
+# Usage: python benchmarks/bench_savegame.py [largest number of cells]
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+import savegame
+
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    sizes = [cells for cells in (10_000, 100_000, 1_000_000, 10_000_000) if cells <= largest]
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "savegame.bin")
+        for cells in sizes:
+            side = int(cells ** 0.5)
+            board = engine.Board(side, side, side * side // 6, seed=0)
+            board.left_click(side // 2, side // 2)
+
+            start = time.perf_counter()
+            save = savegame.create(path, board)
+            save.write_mines(board, 0.0)
+            created = time.perf_counter() - start
+
+            # Flag moves, each saved as the game would
+            moves = 1000
+            start = time.perf_counter()
+            for _ in range(moves):
+                row, col = rng.randrange(side), rng.randrange(side)
+                save.update(board, board.right_click(row, col), 1.0)
+            per_move = (time.perf_counter() - start) / moves
+            save.close()
+
+            start = time.perf_counter()
+            save = savegame.SaveFile(path)
+            opened = time.perf_counter() - start
+            start = time.perf_counter()
+            loaded = save.load()
+            load_time = time.perf_counter() - start
+            save.close()
+            assert loaded.flagged == board.flagged and loaded.revealed == board.revealed and loaded.mine == board.mine
+
+            print(f"{side * side:>10} cells: file {os.path.getsize(path) / 1e6:7.2f}MB, create {created * 1000:8.2f}ms, "
+                  f"move {per_move * 1e6:6.1f}us, open {opened * 1e6:6.1f}us, full load {load_time * 1000:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
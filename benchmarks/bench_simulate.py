@@ -0,0 +1,33 @@
+# Measures how the batch simulator scales from one worker up to every core
+# Usage: python benchmarks/bench_simulate.py [games] [difficulty]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+import simulate
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    difficulty = sys.argv[2] if len(sys.argv) > 2 else "Medium"
+    rows, cols, mines = engine.difficulties[difficulty]
+    cores = os.cpu_count() or 1
+
+    counts = sorted({1, 2, 4, 8, 16, 32, 64, cores} & set(range(1, cores + 1)))
+    print(f"{games} {difficulty} games, {cores} cores")
+    print(f"{'workers':<10}{'games/s':>10}{'speedup':>10}{'efficiency':>12}")
+    single = None
+    for workers in counts:
+        start = time.perf_counter()
+        for _ in simulate.simulate(games, rows, cols, mines, "play", seed=1201, workers=workers):
+            pass
+        rate = games / (time.perf_counter() - start)
+        single = single or rate
+        print(f"{workers:<10}{rate:>10.0f}{rate / single:>9.2f}x{rate / single / workers:>11.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# Solves many boards of each difficulty and reports win rate, time per game and time per solver phase
+# Usage: python benchmarks/bench_solver.py [games]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+import solver
+
+
+def main():
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for name, (rows, cols, mines) in engine.difficulties.items():
+        wins = 0
+        totals = {phase: 0.0 for phase in solver.phases}
+        start = time.perf_counter()
+        for seed in range(games):
+            won, stats = solver.solve_board(rows, cols, mines, seed=seed)
+            wins += won
+            for phase in solver.phases:
+                totals[phase] += stats[phase]["ms"]
+        taken = time.perf_counter() - start
+        phase_text = ", ".join(f"{phase} {totals[phase] / games:.2f}ms" for phase in solver.phases)
+        print(f"{name:<8} win rate {wins / games:6.1%}, {taken / games * 1000:6.2f}ms per game ({phase_text})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Measures startup time and how long switching screens takes, with screens kept after their first build
+# against every screen being rebuilt on each switch (what the game did before screens were cached)
+# Needs a display (run under Xvfb on a headless machine)
+# Usage: python benchmarks/bench_startup.py [rounds]
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+root_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_directory)
+
+
+# Time to run a Python snippet in a fresh interpreter, in milliseconds
+def run_ms(code):
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", code], cwd=root_directory, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+
+    # Importing main no longer opens a window, so it can be timed on its own
+    baseline = statistics.median(run_ms("pass") for _ in range(5))
+    importing = statistics.median(run_ms("import main") for _ in range(5))
+    print(f"import main: {importing - baseline:7.1f}ms (over a bare interpreter)")
+
+    # Files the game writes (leaderboard, save file, replays) go to a scratch folder
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        import main
+
+        start = time.perf_counter()
+        root = main.setup(start_filler=False)
+        root.update()
+        print(f"startup to title screen drawn: {(time.perf_counter() - start) * 1000:7.1f}ms")
+
+        main.player_name = "bench"
+        switches = [
+            ("instructions", main.start),
+            ("enter name", main.enter_name),
+            ("choose difficulty", main.choose_difficulty),
+            ("game (Hard)", lambda: main.game(main.hard_rows, main.hard_columns, main.hard_mines, main.hard_flags)),
+            ("leaderboard", lambda: main.show_leaderboard("Hard")),
+            ("title", main.title),
+        ]
+
+        def time_switch(show):
+            start = time.perf_counter()
+            show()
+            root.update()
+            return (time.perf_counter() - start) * 1000
+
+        first = {name: time_switch(show) for name, show in switches}
+        cached = {name: [] for name, _ in switches}
+        rebuilt = {name: [] for name, _ in switches}
+        for _ in range(rounds):
+            for name, show in switches:
+                cached[name].append(time_switch(show))
+        # Throwing every screen away before each switch, as the old destroy-and-rebuild code did
+        for _ in range(rounds):
+            for name, show in switches:
+                for frame, _ in main.screens.values():
+                    frame.destroy()
+                main.screens.clear()
+                main.board_views.clear()
+                main.current_screen = None
+                rebuilt[name].append(time_switch(show))
+
+        print(f"{'screen':<20} {'first':>9} {'cached':>9} {'rebuilt':>9}")
+        for name, _ in switches:
+            print(f"{name:<20} {first[name]:8.2f}ms {statistics.median(cached[name]):8.2f}ms "
+                  f"{statistics.median(rebuilt[name]):8.2f}ms")
+
+        main.shutdown()
+        root.destroy()
+        os.chdir(root_directory)
+
+
+if __name__ == "__main__":
+    main()
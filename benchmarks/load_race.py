@@ -0,0 +1,151 @@
+# Starts the race server in its own process and plays it with many bot clients over localhost,
+# then reports move latency (from sending a move to getting its answer) at p50 and p99
+# Bots play by the simple rules simulate.py uses and guess when those give nothing
+# Usage: python benchmarks/load_race.py [bots] [players per race] [difficulty]
+import asyncio
+import os
+import random
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+
+root_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_directory)
+
+import engine
+
+port = 5516
+# Neighbor lists per board size, shared by every bot
+neighbor_lists = {}
+
+
+def neighbors_for(rows, cols):
+    if (rows, cols) not in neighbor_lists:
+        board = engine.Board(rows, cols, 0)
+        neighbor_lists[rows, cols] = [board.neighbors(*board.position(i)) for i in range(rows * cols)]
+    return neighbor_lists[rows, cols]
+
+
+class Bot:
+    def __init__(self, number, latencies, rng):
+        self.number = number
+        self.latencies = latencies
+        self.rng = rng
+        self.values = {}
+        self.flagged = set()
+        self.result = None
+
+    # Sends one move and waits for its answer, skipping other players' progress on the way
+    async def move(self, action, cell):
+        start = time.perf_counter()
+        self.writer.write(f"{action} {cell}\n".encode())
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                raise ConnectionError("server closed the connection mid-race")
+            if line[:1] in b"OFE":
+                self.latencies.append(time.perf_counter() - start)
+                break
+        if line.startswith(b"O "):
+            for item in line[2:].split():
+                i, value = item.split(b":")
+                self.values[int(i)] = "X" if value == b"X" else int(value)
+                if value == b"X":
+                    self.result = "L"
+        elif line.startswith(b"F "):
+            _, i, on = line.split()
+            (self.flagged.add if on == b"1" else self.flagged.discard)(int(i))
+        safe = self.size - self.mines
+        if self.result is None and (len(self.values) == safe or len(self.flagged) == self.mines):
+            self.result = "W"
+
+    # The moves the rules are sure of, or one guess
+    def next_moves(self):
+        moves = []
+        for i, value in self.values.items():
+            if value == "X" or value == 0:
+                continue
+            hidden = [n for n in self.neighbors[i] if n not in self.values and n not in self.flagged]
+            if not hidden:
+                continue
+            flags = sum(1 for n in self.neighbors[i] if n in self.flagged)
+            if value == flags:
+                moves += [("R", n) for n in hidden]
+            elif value == flags + len(hidden):
+                moves += [("F", n) for n in hidden]
+        if moves:
+            return moves
+        hidden = [i for i in range(self.size) if i not in self.values and i not in self.flagged]
+        return [("R", self.rng.choice(hidden))]
+
+    async def play(self, host, port):
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.writer.write(f"J bot{self.number}\n".encode())
+        line = await self.reader.readline()
+        rows, cols, self.mines, _, _, start = map(int, line.split()[1:])
+        self.size = rows * cols
+        self.neighbors = neighbors_for(rows, cols)
+
+        await self.move("R", start)
+        while self.result is None:
+            for action, cell in self.next_moves():
+                if self.result is not None:
+                    break
+                # An earlier move in this batch may have opened or flagged it already
+                if cell in self.values or (action == "F" and cell in self.flagged):
+                    continue
+                await self.move(action, cell)
+        # Staying connected until everyone in the race is done
+        while await self.reader.readline():
+            pass
+        self.writer.close()
+
+
+async def run_bots(bots, host, port):
+    latencies = []
+    rng = random.Random(2022)
+    players = [Bot(number, latencies, random.Random(rng.randrange(2**32))) for number in range(bots)]
+    start = time.perf_counter()
+    await asyncio.gather(*(bot.play(host, port) for bot in players))
+    return players, latencies, time.perf_counter() - start
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def main():
+    bots = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    players = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    difficulty = sys.argv[3] if len(sys.argv) > 3 else "Hard"
+
+    with tempfile.TemporaryDirectory() as directory:
+        database = os.path.join(directory, "leaderboard.db")
+        server = subprocess.Popen([sys.executable, os.path.join(root_directory, "race_server.py"),
+                                   "--port", str(port), "--players", str(players), "--difficulty", difficulty,
+                                   "--leaderboard", database, "--seed", "2022"],
+                                  stdout=subprocess.PIPE, text=True)
+        try:
+            # The server prints a line once it is listening
+            server.stdout.readline()
+            finished, latencies, taken = asyncio.run(run_bots(bots, "127.0.0.1", port))
+        finally:
+            server.send_signal(signal.SIGINT)
+            server.wait(timeout=30)
+
+        wins = sum(1 for bot in finished if bot.result == "W")
+        saved = sqlite3.connect(database).execute("SELECT COUNT(*) FROM times").fetchone()[0]
+
+    print(f"{bots} bots in races of {players} on {difficulty}: {taken:.2f}s")
+    print(f"moves: {len(latencies)} ({len(latencies) / taken:.0f}/s)")
+    print(f"move latency p50: {percentile(latencies, 0.5) * 1000:.2f}ms  p99: {percentile(latencies, 0.99) * 1000:.2f}ms  "
+          f"max: {max(latencies) * 1000:.2f}ms")
+    print(f"wins: {wins}, losses: {bots - wins}, winning times in the leaderboard: {saved}")
+
+
+if __name__ == "__main__":
+    main()
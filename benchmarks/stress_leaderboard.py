@@ -0,0 +1,64 @@
+# Starts several processes that all write to one leaderboard database at once,
+# then checks that every result arrived exactly once and unchanged
+# Usage: python benchmarks/stress_leaderboard.py [processes] [results per process] [batch size]
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import leaderboard
+
+difficulties = ["Easy", "Medium", "Hard"]
+
+
+# Every result can be rebuilt from (process, number), so anything torn or mixed up shows when checking
+def result(process, number):
+    return difficulties[number % 3], f"writer {process}, game {number}", process * 1_000_000 + number + 0.25
+
+
+def writer(path, process, count, batch_size):
+    scores = leaderboard.Leaderboard(path, batch_size=batch_size)
+    for number in range(count):
+        scores.save_time(*result(process, number))
+    scores.close()
+
+
+def main():
+    processes = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 5000
+    batch_size = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "leaderboard.db")
+        leaderboard.Leaderboard(path).close()
+
+        start = time.perf_counter()
+        workers = [multiprocessing.Process(target=writer, args=(path, p, count, batch_size)) for p in range(processes)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        taken = time.perf_counter() - start
+        failed = [worker.exitcode for worker in workers if worker.exitcode != 0]
+
+        scores = leaderboard.Leaderboard(path)
+        rows = scores.connection.execute("SELECT difficulty, name, time FROM times").fetchall()
+        scores.close()
+
+    expected = {result(p, n) for p in range(processes) for n in range(count)}
+    found = set(rows)
+    print(f"{processes} processes x {count} results, batches of {batch_size}: {taken:.2f}s "
+          f"({processes * count / taken:.0f} results/s)")
+    print(f"rows written: {len(rows)}, expected: {len(expected)}")
+    print(f"missing: {len(expected - found)}, unexpected: {len(found - expected)}, "
+          f"duplicates: {len(rows) - len(found)}, failed processes: {len(failed)}")
+    if failed or found != expected or len(rows) != len(expected):
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
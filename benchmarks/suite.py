@@ -0,0 +1,257 @@
+# Runs a fixed set of benchmarks over the engine, the board canvas and the leaderboard, with fixed seeds,
+# and compares each one with a stored baseline; a case slower than its baseline by more than the threshold
+# is reported as a regression and makes the script exit with status 1
+# The board canvas cases need a display (run under Xvfb on a headless machine) and are skipped without one
+# Timings depend on the machine, so run with --update once to record a baseline before comparing against it
+# The default threshold sits above the noise measured on a busy shared machine, where unchanged code
+# came out up to 55% slower than its baseline; a quieter machine can use a lower one
+# Usage: python benchmarks/suite.py [--baseline PATH] [--threshold 0.6] [--rounds 15] [--update] [--only GROUP ...]
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+root_directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, root_directory)
+
+import engine
+
+default_baseline = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+seed = 2021
+
+
+# Runs function enough times to take at least min_total seconds and returns the best time of one call
+# function does `inner` calls of whatever is being measured, for things too quick to time one at a time
+def best_time(function, inner=1, min_total=0.05):
+    best = float("inf")
+    total = 0.0
+    runs = 0
+    while total < min_total or runs < 3:
+        start = time.perf_counter()
+        function()
+        taken = time.perf_counter() - start
+        best = min(best, taken)
+        total += taken
+        runs += 1
+    return best / inner
+
+
+# Mine cells for a board, the same every run
+def fixed_mines(rows, cols, mines):
+    board = engine.Board(rows, cols, mines, seed=seed)
+    return board.sample_mines(rows // 2, cols // 2)
+
+
+# Each group of cases returns a list of (name, function, inner), with inner as in best_time()
+# Anything a group has to close once every round is done goes on cleanups
+
+def place_mines_cases(cleanups):
+    rows, cols = 100, 100
+    cases = []
+    for density in (0.1, 0.2, 0.5, 0.8):
+        mines = int(rows * cols * density)
+
+        def place(mines=mines):
+            engine.Board(rows, cols, mines, seed=seed).place_mines(rows // 2, cols // 2)
+        cases.append((f"place_mines 100x100 {density:.0%}", place, 1))
+    return cases
+
+
+def adjacency_cases(cleanups):
+    cases = []
+    for name, (rows, cols, mines) in [("Hard", engine.difficulties["Hard"]), ("1000x1000", (1000, 1000, 206250))]:
+        mine = bytearray(rows * cols)
+        for i in fixed_mines(rows, cols, mines):
+            mine[i] = 1
+
+        def count(mine=mine, rows=rows, cols=cols):
+            engine.adjacency_counts(mine, rows, cols)
+        cases.append((f"adjacency_counts {name}", count, 1))
+    return cases
+
+
+def cascade_cases(cleanups):
+    cases = []
+    for rows, cols, mines in [(100, 100, 300), (1000, 1000, 5000)]:
+        board = engine.Board(rows, cols, mines, seed=seed)
+        board.set_mines(fixed_mines(rows, cols, mines))
+
+        # Hiding the board again before every reveal, so each call opens the same area from scratch
+        def reveal(board=board, unrevealed_safe=board.unrevealed_safe):
+            board.revealed = bytearray(board.size)
+            board.unrevealed_safe = unrevealed_safe
+            board.reveal_cells(board.rows // 2, board.cols // 2)
+        cases.append((f"reveal_cells cascade {rows}x{cols}", reveal, 1))
+    return cases
+
+
+def check_win_cases(cleanups):
+    rows, cols, mines = engine.difficulties["Hard"]
+    board = engine.Board(rows, cols, mines, seed=seed)
+    board.left_click(rows // 2, cols // 2)
+    check_win = board.check_win
+
+    def check():
+        for _ in range(10000):
+            check_win()
+    return [("check_win Hard", check, 10000)]
+
+
+def board_canvas_cases(cleanups):
+    import tkinter as tk
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        print("No display, skipping the board canvas cases", file=sys.stderr)
+        return []
+    cleanups.append(root.destroy)
+    import renderer
+    frame = tk.Frame(root)
+    frame.pack(expand=True, fill=tk.BOTH)
+    root.update()
+    cases = []
+    for name, rows, cols in [("Hard", 16, 30), ("100x100", 100, 100)]:
+        def build(rows=rows, cols=cols):
+            board_view = renderer.BoardCanvas(frame, rows, cols, "TkDefaultFont", "#a8dba8", "#c1ffc1", "#ABC4AA")
+            board_view.bind_click(1, lambda row, col: None)
+            board_view.bind_click(3, lambda row, col: None)
+            board_view.pack(expand=True, fill=tk.BOTH)
+            root.update()
+            board_view.destroy()
+        cases.append((f"BoardCanvas build {name}", build, 1))
+    return cases
+
+
+def top_times_cases(cleanups):
+    import leaderboard
+    import main
+    rng = random.Random(seed)
+    directory = tempfile.TemporaryDirectory()
+    cleanups.append(directory.cleanup)
+    cases = []
+    for rows in (1_000, 100_000, 1_000_000):
+        scores = leaderboard.Leaderboard(os.path.join(directory.name, f"{rows}.db"))
+        cleanups.insert(0, scores.close)
+        with scores._write() as connection:
+            connection.executemany(
+                "INSERT INTO times (difficulty, name, time) VALUES (?, ?, ?)",
+                ((rng.choice(("Easy", "Medium", "Hard")), f"player{rng.randrange(1000)}", rng.uniform(5, 1000))
+                 for _ in range(rows)))
+
+        # get_top_times reads the game's global leaderboard, so each case points it at its own one
+        def lookup(scores=scores):
+            main.scores = scores
+            for _ in range(100):
+                main.get_top_times("Hard")
+        cases.append((f"get_top_times {rows} rows", lookup, 100))
+    return cases
+
+
+# Groups of cases by the name --only picks them with
+groups = {
+    "place_mines": place_mines_cases,
+    "adjacency": adjacency_cases,
+    "cascade": cascade_cases,
+    "check_win": check_win_cases,
+    "canvas": board_canvas_cases,
+    "top_times": top_times_cases,
+}
+
+
+# Times every case once per round, going through all of them each round, and keeps each case's fastest round
+# A busy spell on the machine only slows the rounds it lands in, and with each case's rounds spread over
+# the whole run it cannot cover every round of one case
+# The garbage collector is paused while timing, as timeit does, so a collection does not land in one case only
+def run_cases(cases, rounds):
+    results = {name: float("inf") for name, _, _ in cases}
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(rounds):
+            for name, function, inner in cases:
+                results[name] = min(results[name], best_time(function, inner))
+    finally:
+        gc.enable()
+    return results
+
+
+def format_time(seconds):
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.2f}us"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare it with a stored baseline")
+    parser.add_argument("--baseline", default=default_baseline, help="baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.6,
+                        help="slowdown past which a case is a regression, as a fraction (default 0.6)")
+    parser.add_argument("--rounds", type=int, default=15, help="rounds over every case (default 15)")
+    parser.add_argument("--update", action="store_true", help="write these results to the baseline instead")
+    parser.add_argument("--only", nargs="+", choices=list(groups), help="run only these groups of cases")
+    args = parser.parse_args(argv)
+    if args.rounds < 1:
+        parser.error(f"--rounds must be at least 1, got {args.rounds}")
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    environment = {"python": platform.python_version(), "machine": platform.machine(),
+                   "numpy": engine.np is not None}
+    if baseline and not args.update and baseline.get("environment") != environment:
+        print(f"Baseline was recorded on {baseline.get('environment')}, this is {environment}", file=sys.stderr)
+    expected = baseline.get("results", {})
+
+    cleanups = []
+    cases = []
+    try:
+        for group, make_cases in groups.items():
+            if not args.only or group in args.only:
+                cases += make_cases(cleanups)
+        results = run_cases(cases, args.rounds)
+        # Timing anything that looks slower again, so one busy spell on the machine is not reported as a regression
+        suspects = [case for case in cases
+                    if case[0] in expected and results[case[0]] > expected[case[0]] * (1 + args.threshold)]
+        if suspects and not args.update:
+            for name, seconds in run_cases(suspects, args.rounds).items():
+                results[name] = min(results[name], seconds)
+    finally:
+        for cleanup in cleanups:
+            cleanup()
+
+    regressions = []
+    print(f"{'case':<34}{'time':>12}{'baseline':>12}{'change':>10}")
+    for name, seconds in results.items():
+        before = expected.get(name)
+        if before is None:
+            print(f"{name:<34}{format_time(seconds):>12}{'-':>12}{'new':>10}")
+            continue
+        change = seconds / before - 1
+        flag = ""
+        if change > args.threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<34}{format_time(seconds):>12}{format_time(before):>12}{change:>+10.1%}{flag}")
+
+    if args.update:
+        # Keeping cases that did not run this time, e.g. the canvas cases on a machine without a display
+        baseline = {"environment": environment, "results": {**expected, **results}}
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if regressions:
+        print(f"{len(regressions)} regression(s) past {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+import argparse
+import os
+import random
+import signal
+import sqlite3
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+import engine
+import solver
+
+# Pool of "no guess" boards: boards the solver can clear from a set first click without ever guessing
+# Checking a board takes a full solve, so boards are made ahead of time by a separate filler process
+# (python board_pool.py --fill) running a pool of workers, and kept per difficulty in a SQLite file
+# The game takes a ready board from the pool when a difficulty is picked, and falls back to a normal board on a miss
+#
+# Usage: python board_pool.py --fill            keep every difficulty topped up until stopped
+#        python board_pool.py --stats           show pool sizes, hit rates and generation throughput
+
+
+# Packs a list of mine cells into bytes, one bit per cell
+def pack_mines(cells, size):
+    bits = 0
+    for i in cells:
+        bits |= 1 << i
+    return bits.to_bytes((size + 7) // 8, "little")
+
+
+def unpack_mines(data):
+    bits = int.from_bytes(data, "little")
+    cells = []
+    i = 0
+    while bits:
+        if bits & 1:
+            cells.append(i)
+        bits >>= 1
+        i += 1
+    return cells
+
+
+# Makes boards until one can be solved from its first click without guessing
+# Returns (seed, first row, first column, packed mines, boards tried, seconds taken)
+def generate_board(rows, cols, mines, seed, max_attempts=10000):
+    start = time.perf_counter()
+    rng = random.Random(seed)
+    first_row, first_col = rows // 2, cols // 2
+    for attempt in range(1, max_attempts + 1):
+        board_seed = rng.getrandbits(63)
+        board = engine.Board(rows, cols, mines, seed=board_seed)
+        if solver.Solver(board, guess=False).solve(first_row, first_col):
+            cells = [i for i in range(board.size) if board.mine[i]]
+            return board_seed, first_row, first_col, pack_mines(cells, board.size), attempt, time.perf_counter() - start
+    return None
+
+
+class BoardPool:
+    def __init__(self, path="board_pool.db", capacity=20, timeout=30.0):
+        self.path = path
+        # Most boards kept per difficulty; the oldest are dropped past this
+        self.capacity = capacity
+        self.timeout = timeout
+        # The filler process, if this pool started one
+        self.filler = None
+        with self.connect() as connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS boards (
+                    id INTEGER PRIMARY KEY,
+                    difficulty TEXT NOT NULL,
+                    seed INTEGER NOT NULL,
+                    first_row INTEGER NOT NULL,
+                    first_col INTEGER NOT NULL,
+                    mines BLOB NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS boards_by_difficulty ON boards (difficulty, id);
+                CREATE TABLE IF NOT EXISTS takes (
+                    difficulty TEXT PRIMARY KEY,
+                    hits INTEGER NOT NULL,
+                    misses INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS generation (
+                    difficulty TEXT PRIMARY KEY,
+                    boards INTEGER NOT NULL,
+                    attempts INTEGER NOT NULL,
+                    seconds REAL NOT NULL
+                );
+            """)
+
+    # Opens a connection for one transaction; each thread or process uses its own
+    @contextmanager
+    def connect(self):
+        connection = sqlite3.connect(self.path, timeout=self.timeout)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+    # Number of ready boards for a difficulty
+    def size(self, difficulty):
+        with self.connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM boards WHERE difficulty = ?", (difficulty,)).fetchone()[0]
+
+    # Adds a board, dropping the oldest ones past the capacity
+    def add(self, difficulty, seed, first_row, first_col, mines):
+        with self.connect() as connection:
+            connection.execute("INSERT INTO boards (difficulty, seed, first_row, first_col, mines) VALUES (?, ?, ?, ?, ?)",
+                               (difficulty, seed, first_row, first_col, mines))
+            connection.execute("""
+                DELETE FROM boards WHERE difficulty = ? AND id NOT IN
+                    (SELECT id FROM boards WHERE difficulty = ? ORDER BY id DESC LIMIT ?)
+            """, (difficulty, difficulty, self.capacity))
+
+    # Takes a ready board out of the pool, counting the hit or miss in the pool file so --stats can show it
+    # Returns (first row, first column, mine cells), or None if the pool is empty
+    def take(self, difficulty):
+        with self.connect() as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute("SELECT id, first_row, first_col, mines FROM boards WHERE difficulty = ? "
+                                     "ORDER BY id LIMIT 1", (difficulty,)).fetchone()
+            if row is not None:
+                connection.execute("DELETE FROM boards WHERE id = ?", (row[0],))
+            connection.execute("""
+                INSERT INTO takes (difficulty, hits, misses) VALUES (?, ?, ?)
+                ON CONFLICT (difficulty) DO UPDATE SET
+                    hits = hits + excluded.hits,
+                    misses = misses + excluded.misses
+            """, (difficulty, int(row is not None), int(row is None)))
+        if row is None:
+            return None
+        return row[1], row[2], unpack_mines(row[3])
+
+    # Adds a filler's results to the throughput counters
+    def record_generation(self, difficulty, boards, attempts, seconds):
+        with self.connect() as connection:
+            connection.execute("""
+                INSERT INTO generation (difficulty, boards, attempts, seconds) VALUES (?, ?, ?, ?)
+                ON CONFLICT (difficulty) DO UPDATE SET
+                    boards = boards + excluded.boards,
+                    attempts = attempts + excluded.attempts,
+                    seconds = seconds + excluded.seconds
+            """, (difficulty, boards, attempts, seconds))
+
+    # Pool hit rate over every game that used this pool file, and pool size, hit rate and generation
+    # throughput per difficulty
+    def metrics(self):
+        result = {"hits": 0, "misses": 0, "hit_rate": None, "difficulties": {}}
+        with self.connect() as connection:
+            for difficulty in engine.difficulties:
+                row = connection.execute("SELECT boards, attempts, seconds FROM generation WHERE difficulty = ?",
+                                         (difficulty,)).fetchone()
+                boards, attempts, seconds = row or (0, 0, 0.0)
+                hits, misses = connection.execute("SELECT hits, misses FROM takes WHERE difficulty = ?",
+                                                  (difficulty,)).fetchone() or (0, 0)
+                result["hits"] += hits
+                result["misses"] += misses
+                result["difficulties"][difficulty] = {
+                    "ready": self.size(difficulty),
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": hits / (hits + misses) if hits + misses else None,
+                    "generated": boards,
+                    "boards_per_second": boards / seconds if seconds else None,
+                    "attempts_per_board": attempts / boards if boards else None,
+                }
+        taken = result["hits"] + result["misses"]
+        result["hit_rate"] = result["hits"] / taken if taken else None
+        return result
+
+    # Tops every difficulty up to capacity, generating boards on a pool of worker processes
+    # Keeps checking every `interval` seconds if forever is True
+    def fill(self, workers=None, forever=False, interval=1.0):
+        # Imported here, since the game only takes boards and should not pay for loading multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        workers = workers or os.cpu_count() or 1
+        seeds = random.Random()
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            while True:
+                jobs = []
+                for difficulty, (rows, cols, mines) in engine.difficulties.items():
+                    for _ in range(self.capacity - self.size(difficulty)):
+                        job = executor.submit(generate_board, rows, cols, mines, seeds.getrandbits(63))
+                        jobs.append((difficulty, job))
+                for difficulty, job in jobs:
+                    board = job.result()
+                    if board is None:
+                        continue
+                    seed, first_row, first_col, mines, attempts, seconds = board
+                    self.add(difficulty, seed, first_row, first_col, mines)
+                    # Workers run side by side, so the pool's throughput counts their time divided between them
+                    self.record_generation(difficulty, 1, attempts, seconds / workers)
+                if not forever:
+                    return
+                time.sleep(interval)
+
+    # Starts a filler in its own process, so generating boards never slows the game down
+    def start_filler(self, workers=None):
+        if self.filler is not None and self.filler.poll() is None:
+            return
+        command = [sys.executable, os.path.abspath(__file__), "--fill", "--forever",
+                   "--path", self.path, "--capacity", str(self.capacity)]
+        if workers:
+            command += ["--workers", str(workers)]
+        # The filler gets its own process group (session on POSIX), so stopping it can take its workers down too
+        if sys.platform == "win32":
+            self.filler = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                           creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+        else:
+            self.filler = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                           start_new_session=True)
+
+    # Stops the filler and every worker process it started
+    # Terminating only the filler would leave its pool's workers running after the game closes
+    def stop_filler(self):
+        if self.filler is not None and self.filler.poll() is None:
+            if sys.platform == "win32":
+                # /T takes the whole tree of processes started by the filler
+                subprocess.run(["taskkill", "/F", "/T", "/PID", str(self.filler.pid)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            else:
+                try:
+                    os.killpg(self.filler.pid, signal.SIGTERM)
+                except ProcessLookupError:
+                    pass
+            self.filler.wait()
+        self.filler = None
+
+
+# Hit rate as a percentage, or "-" before any game has asked the pool for a board
+def format_rate(rate):
+    return "-" if rate is None else f"{rate:.1%}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate and store Minesweeper boards that need no guessing")
+    parser.add_argument("--path", default="board_pool.db", help="pool file")
+    parser.add_argument("--capacity", type=int, default=20, help="boards kept per difficulty")
+    parser.add_argument("--workers", type=int, help="worker processes (default: every core)")
+    parser.add_argument("--fill", action="store_true", help="top every difficulty up to capacity")
+    parser.add_argument("--forever", action="store_true", help="with --fill, keep the pool topped up until stopped")
+    parser.add_argument("--stats", action="store_true", help="print pool sizes, hit rates and generation throughput")
+    args = parser.parse_args(argv)
+
+    pool = BoardPool(args.path, args.capacity)
+    if args.fill:
+        pool.fill(args.workers, args.forever)
+    if args.stats or not args.fill:
+        metrics = pool.metrics()
+        for difficulty, stats in metrics["difficulties"].items():
+            rate = stats["boards_per_second"]
+            attempts = stats["attempts_per_board"]
+            print(f"{difficulty:<8} {stats['ready']:>4} ready, {stats['generated']:>6} generated, "
+                  f"{rate or 0:8.2f} boards/s, {attempts or 0:8.1f} tries per board, "
+                  f"hit rate {format_rate(stats['hit_rate'])} ({stats['hits']}/{stats['hits'] + stats['misses']})")
+        print(f"{'All':<8} hit rate {format_rate(metrics['hit_rate'])} "
+              f"({metrics['hits']}/{metrics['hits'] + metrics['misses']} games got a ready board)")
+
+
+if __name__ == "__main__":
+    main()
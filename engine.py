@@ -0,0 +1,312 @@
+import random
+from bisect import bisect_right
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Headless board engine used by the game window (and anything else that wants to play without Tk)
+# Cells are stored in flat arrays indexed by row * cols + col, one byte per cell per layer
+
+# Difficulty presets as (rows, columns, mines)
+difficulties = {
+    "Easy": (9, 9, 10),
+    "Medium": (16, 16, 40),
+    "Hard": (16, 30, 99),
+}
+
+# Byte translation table that turns 0 into 1 and everything else into 0
+_ZERO_TO_ONE = bytes([1] + [0] * 255)
+
+
+# Counts the set bits of an int; with 0/1 bytes this is the number of cells set in a layer
+def _count_ones(value):
+    return bin(value).count("1")
+
+
+# Boards with fewer than one mine per this many cells count around each mine instead of over every cell
+# NumPy's box sum is far quicker per cell than the plain Python one, so with it only much emptier boards do
+_SPARSE_CELLS_PER_MINE = 512 if np is not None else 32
+
+
+# Calculates the number of adjacent mines for every cell at once
+# Uses a 3x3 box sum over the padded grid with NumPy when it is installed, otherwise plain Python
+# Nearly empty boards only add one to the cells around each mine, which takes time for the mines and not the cells
+def adjacency_counts(mine, rows, cols):
+    if mine.count(1) * _SPARSE_CELLS_PER_MINE < rows * cols:
+        return _adjacency_counts_sparse(mine, rows, cols)
+    if np is not None:
+        return _adjacency_counts_numpy(mine, rows, cols)
+    return _adjacency_counts_python(mine, rows, cols)
+
+
+def _adjacency_counts_sparse(mine, rows, cols):
+    counts = bytearray(rows * cols)
+    i = mine.find(1)
+    while i != -1:
+        row, col = divmod(i, cols)
+        for r in range(max(0, row-1), min(rows, row+2)):
+            for c in range(max(0, col-1), min(cols, col+2)):
+                counts[r * cols + c] += 1
+        # The loop above counted the mine as its own neighbor
+        counts[i] -= 1
+        i = mine.find(1, i + 1)
+    return counts
+
+
+def _adjacency_counts_numpy(mine, rows, cols):
+    grid = np.frombuffer(bytes(mine), dtype=np.uint8).reshape(rows, cols)
+    padded = np.pad(grid, 1)
+    # Adding up the 9 shifted copies of the board, then taking away the cell itself
+    total = np.zeros((rows, cols), dtype=np.uint8)
+    for dr in range(3):
+        for dc in range(3):
+            total += padded[dr:dr+rows, dc:dc+cols]
+    total -= grid
+    return bytearray(total.tobytes())
+
+
+def _adjacency_counts_python(mine, rows, cols):
+    # Summing each row with its left and right neighbors
+    zero_row = [0] * (cols + 2)
+    horizontal = [zero_row]
+    for row in range(rows):
+        line = [0, *mine[row * cols:(row + 1) * cols], 0]
+        horizontal.append([a + b + c for a, b, c in zip(line, line[1:], line[2:])])
+    horizontal.append(zero_row)
+
+    # Summing each row of horizontal sums with the rows above and below, then taking away the cell itself
+    counts = bytearray(rows * cols)
+    for row in range(rows):
+        own = mine[row * cols:(row + 1) * cols]
+        counts[row * cols:(row + 1) * cols] = bytes(
+            a + b + c - m for a, b, c, m in zip(horizontal[row], horizontal[row + 1], horizontal[row + 2], own))
+    return counts
+
+
+class Board:
+    __slots__ = ("rows", "cols", "mines", "size", "mine", "counts", "revealed", "flagged",
+                 "flags_left", "placed", "lost", "won", "seed", "rng",
+                 "correct_flags", "wrong_flags", "unrevealed_safe")
+
+    def __init__(self, rows, cols, mines, flags=None, seed=None):
+        if rows < 1 or cols < 1:
+            raise ValueError(f"board must be at least 1x1, got {rows}x{cols}")
+        # The first click keeps up to a 3x3 area clear, so the rest of the board has to fit every mine
+        free_cells = rows * cols - min(rows, 3) * min(cols, 3)
+        if mines < 0 or mines > free_cells:
+            raise ValueError(f"{mines} mines do not fit on a {rows}x{cols} board (at most {free_cells})")
+        self.rows = rows
+        self.cols = cols
+        self.mines = mines
+        self.size = rows * cols
+        # Games with the same seed and first click get the same mines, so they can be replayed
+        self.seed = seed
+        self.rng = random.Random(seed)
+        # One byte per cell: 1 if the cell holds a mine
+        self.mine = bytearray(self.size)
+        # Number of adjacent mines for every cell
+        self.counts = bytearray(self.size)
+        # 1 once the cell has been revealed / flagged
+        self.revealed = bytearray(self.size)
+        self.flagged = bytearray(self.size)
+        self.flags_left = mines if flags is None else flags
+        self.placed = False
+        self.lost = False
+        self.won = False
+        # Running counts kept up to date on every move, so checking for a win never scans the board
+        self.correct_flags = 0
+        self.wrong_flags = 0
+        self.unrevealed_safe = self.size - mines
+
+    # Converts a (row, col) pair to a flat index and back
+    def index(self, row, col):
+        return row * self.cols + col
+
+    def position(self, i):
+        return divmod(i, self.cols)
+
+    # Returns the value shown for a cell: "X" for a mine, otherwise the number of adjacent mines
+    def value(self, row, col):
+        i = row * self.cols + col
+        if self.mine[i]:
+            return "X"
+        return self.counts[i]
+
+    # Returns the indexes of every cell around (row, col), not including the cell itself
+    def neighbors(self, row, col):
+        cols = self.cols
+        cells = []
+        for r in range(max(0, row-1), min(self.rows, row+2)):
+            for c in range(max(0, col-1), min(cols, col+2)):
+                if r != row or c != col:
+                    cells.append(r * cols + c)
+        return cells
+
+    # Picks the cells that get a mine, keeping the 3x3 area around the first click clear
+    def sample_mines(self, click_row, click_col):
+        rows, cols = self.rows, self.cols
+
+        # Cells within one cell of the first click, in index order
+        safe = [r * cols + c
+                for r in range(max(0, click_row-1), min(rows, click_row+2))
+                for c in range(max(0, click_col-1), min(cols, click_col+2))]
+        # An allowed position k lands past every safe cell whose index minus the number before it is <= k
+        skips = [s - j for j, s in enumerate(safe)]
+
+        # Picking distinct positions among the allowed cells, then stepping each one past the safe cells
+        # This never retries, so it takes the same time however full the board is
+        picks = self.rng.sample(range(self.size - len(safe)), self.mines)
+        return [k + bisect_right(skips, k) for k in picks]
+
+    # Randomly places mines, keeping the 3x3 area around the first click clear
+    def place_mines(self, click_row, click_col):
+        self.set_mines(self.sample_mines(click_row, click_col))
+
+    # Puts mines on the given cells, e.g. a board made ahead of time
+    def set_mines(self, cells):
+        mine = self.mine
+        for i in cells:
+            mine[i] = 1
+
+        # Calculating each cells value
+        self.counts = adjacency_counts(mine, self.rows, self.cols)
+        self.placed = True
+
+        # Flags placed before the first click may now be sitting on mines
+        self.correct_flags = _count_ones(int.from_bytes(mine, "big") & int.from_bytes(self.flagged, "big"))
+        self.wrong_flags = _count_ones(int.from_bytes(self.flagged, "big")) - self.correct_flags
+        self.unrevealed_safe = self.size - self.mines - _count_ones(int.from_bytes(self.revealed, "big"))
+
+    # Marks which cells of a row are 0 cells that can still be opened (1) and which cannot (0)
+    def _open_zeros(self, row):
+        start, end = row * self.cols, (row + 1) * self.cols
+        # A cell is an unopened 0 when its mine, count, revealed and flagged bytes are all 0
+        blocked = (int.from_bytes(self.mine[start:end], "big") | int.from_bytes(self.counts[start:end], "big")
+                   | int.from_bytes(self.revealed[start:end], "big") | int.from_bytes(self.flagged[start:end], "big"))
+        return bytearray(blocked.to_bytes(self.cols, "big").translate(_ZERO_TO_ONE))
+
+    # Reveals a cell and, if it is a 0, every connected cell around it
+    # Works through a stack of runs of 0 cells instead of recursing, so large open areas cannot hit the recursion limit
+    # Returns the list of cells that were newly revealed
+    def reveal_cells(self, row, col):
+        rows, cols = self.rows, self.cols
+        revealed, flagged = self.revealed, self.flagged
+        i = row * cols + col
+        if revealed[i] or flagged[i]:
+            return []
+
+        # Stopping at a mine or a cell with a non-zero value
+        if self.mine[i]:
+            revealed[i] = 1
+            self.lost = True
+            return [i]
+        if self.counts[i] != 0:
+            revealed[i] = 1
+            self.unrevealed_safe -= 1
+            return [i]
+
+        opened = []
+        runs = []
+        zeros = {}
+        stack = [(row, col)]
+        while stack:
+            row, col = stack.pop()
+            if row not in zeros:
+                zeros[row] = self._open_zeros(row)
+            line = zeros[row]
+            if not line[col]:
+                continue
+
+            # Extending to the whole run of 0 cells on this row and opening it in one go
+            left = line.rfind(0, 0, col) + 1
+            right = line.find(0, col)
+            if right == -1:
+                right = cols
+            line[left:right] = bytes(right - left)
+            start = row * cols
+            revealed[start + left:start + right] = b"\x01" * (right - left)
+            opened.extend(range(start + left, start + right))
+            runs.append((row, left, right))
+
+            # Queueing every run of 0 cells touching this one on the rows above and below
+            low, high = max(0, left - 1), min(cols, right + 1)
+            for r in (row - 1, row + 1):
+                if 0 <= r < rows:
+                    if r not in zeros:
+                        zeros[r] = self._open_zeros(r)
+                    above = zeros[r]
+                    c = above.find(1, low, high)
+                    while c != -1:
+                        stack.append((r, c))
+                        c = above.find(0, c, high)
+                        if c == -1:
+                            break
+                        c = above.find(1, c, high)
+
+        # Opening the numbered cells around the edge of the area
+        for row, left, right in runs:
+            low, high = max(0, left - 1), min(cols, right + 1)
+            for r in range(max(0, row - 1), min(rows, row + 2)):
+                end = r * cols + high
+                n = revealed.find(0, r * cols + low, end)
+                while n != -1:
+                    if not flagged[n]:
+                        revealed[n] = 1
+                        opened.append(n)
+                    n = revealed.find(0, n + 1, end)
+        self.unrevealed_safe -= len(opened)
+        return opened
+
+    # Left click on a cell, placing the mines first if this is the first click
+    # Returns the list of cells that were newly revealed
+    def left_click(self, row, col):
+        i = row * self.cols + col
+        if self.revealed[i] or self.flagged[i] or self.lost or self.won:
+            return []
+        if not self.placed:
+            self.place_mines(row, col)
+
+        # Clicking a mine loses the game, anything else opens cells and may win it
+        opened = self.reveal_cells(row, col)
+        self.check_win()
+        return opened
+
+    # Right click on a cell: places a flag or takes one away
+    # Returns the list of cells that changed, like left_click
+    def right_click(self, row, col):
+        i = row * self.cols + col
+        if self.revealed[i] or self.lost or self.won:
+            return []
+
+        # If there is no flag a flag is placed until the user is out of flags
+        if not self.flagged[i]:
+            if self.flags_left == 0:
+                return []
+            self.flagged[i] = 1
+            self.flags_left -= 1
+            if self.mine[i]:
+                self.correct_flags += 1
+            else:
+                self.wrong_flags += 1
+
+        # If a flag is present it is taken away
+        else:
+            self.flagged[i] = 0
+            self.flags_left += 1
+            if self.mine[i]:
+                self.correct_flags -= 1
+            else:
+                self.wrong_flags -= 1
+        self.check_win()
+        return [i]
+
+    # Checks if the user has won, either by flagging every mine and nothing else or by revealing every safe cell
+    # Uses the running counts, so it takes the same time on any board size
+    def check_win(self):
+        if not self.placed or self.lost:
+            return False
+        if self.unrevealed_safe == 0 or (self.correct_flags == self.mines and self.wrong_flags == 0):
+            self.won = True
+        return self.won
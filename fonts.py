@@ -0,0 +1,66 @@
+import ctypes
+import ctypes.util
+import os
+import sys
+import tkinter.font as tkfont
+
+# Makes the fonts bundled in Fonts/ usable by Tk without installing them
+# They are registered with the OS for this process only, which has to happen before Tk is started
+# Tk quietly draws with a default font when it does not know a family, so pick_family checks and says so
+
+font_directory = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Fonts")
+
+
+# Every .ttf / .otf file under a directory
+def font_files(directory):
+    paths = []
+    for folder, _, names in os.walk(directory):
+        for name in sorted(names):
+            if name.lower().endswith((".ttf", ".otf")):
+                paths.append(os.path.join(folder, name))
+    return paths
+
+
+# Registers one font file for this process; returns True if the OS took it
+def register_font(path):
+    try:
+        if sys.platform == "win32":
+            # 0x10 is FR_PRIVATE: only this process sees the font, and it goes away with the process
+            return ctypes.windll.gdi32.AddFontResourceExW(path, 0x10, 0) > 0
+        if sys.platform == "darwin":
+            core_foundation = ctypes.CDLL(ctypes.util.find_library("CoreFoundation"))
+            core_text = ctypes.CDLL(ctypes.util.find_library("CoreText"))
+            core_foundation.CFURLCreateFromFileSystemRepresentation.restype = ctypes.c_void_p
+            core_foundation.CFURLCreateFromFileSystemRepresentation.argtypes = [
+                ctypes.c_void_p, ctypes.c_char_p, ctypes.c_long, ctypes.c_bool]
+            core_foundation.CFRelease.argtypes = [ctypes.c_void_p]
+            core_text.CTFontManagerRegisterFontsForURL.argtypes = [ctypes.c_void_p, ctypes.c_uint32, ctypes.c_void_p]
+            data = os.fsencode(path)
+            url = core_foundation.CFURLCreateFromFileSystemRepresentation(None, data, len(data), False)
+            # 1 is kCTFontManagerScopeProcess
+            registered = core_text.CTFontManagerRegisterFontsForURL(url, 1, None)
+            core_foundation.CFRelease(url)
+            return bool(registered)
+        # Tk on Linux and the BSDs finds fonts through fontconfig
+        library = ctypes.util.find_library("fontconfig")
+        if library is None:
+            return False
+        fontconfig = ctypes.CDLL(library)
+        fontconfig.FcConfigAppFontAddFile.argtypes = [ctypes.c_void_p, ctypes.c_char_p]
+        return bool(fontconfig.FcConfigAppFontAddFile(None, os.fsencode(path)))
+    except (OSError, AttributeError):
+        return False
+
+
+# Registers every bundled font and returns the files that could not be registered
+def register_fonts(directory=font_directory):
+    return [path for path in font_files(directory) if not register_font(path)]
+
+
+# Returns family if Tk has it, otherwise warns and returns the family of Tk's default font
+def pick_family(root, family):
+    if family in tkfont.families(root):
+        return family
+    fallback = tkfont.nametofont("TkDefaultFont", root).actual("family")
+    print(f"Font {family!r} is not available, using {fallback!r} instead", file=sys.stderr)
+    return fallback
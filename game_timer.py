@@ -0,0 +1,59 @@
+import time
+
+# Game timer based on time.perf_counter_ns, which never jumps when the wall clock changes
+# The exact start and end of a game are recorded when they happen; the 1 second label refresh only displays them
+
+
+class GameTimer:
+    def __init__(self, widget, on_tick, interval_ms=1000, clock=time.perf_counter_ns):
+        # widget is any Tk widget, used for after() / after_cancel()
+        self.widget = widget
+        self.on_tick = on_tick
+        self.interval_ms = interval_ms
+        self.clock = clock
+        self.start_ns = None
+        self.end_ns = None
+        # id of the scheduled refresh, so it can be cancelled
+        self.after_id = None
+
+    @property
+    def running(self):
+        return self.start_ns is not None and self.end_ns is None
+
+    # Time since the game started in seconds, up to the end of the game once it has been stopped
+    @property
+    def elapsed(self):
+        if self.start_ns is None:
+            return 0.0
+        end_ns = self.end_ns if self.end_ns is not None else self.clock()
+        return (end_ns - self.start_ns) / 1e9
+
+    # Starting the timer when the game starts (after first click)
+    # offset is the time already played, for a game picked up from a save
+    def start(self, offset=0.0):
+        self.cancel()
+        self.start_ns = self.clock() - round(offset * 1e9)
+        self.end_ns = None
+        self.tick()
+
+    # Stopping the timer, returning the exact time taken
+    def stop(self):
+        if self.running:
+            self.end_ns = self.clock()
+        self.cancel()
+        return self.elapsed
+
+    # Cancelling the scheduled refresh, if there is one
+    def cancel(self):
+        if self.after_id is not None:
+            self.widget.after_cancel(self.after_id)
+            self.after_id = None
+
+    # Updating the label, then scheduling the next refresh for when the next whole interval has passed
+    def tick(self):
+        self.after_id = None
+        if not self.running:
+            return
+        elapsed_ms = (self.clock() - self.start_ns) // 1_000_000
+        self.on_tick(elapsed_ms / 1000)
+        self.after_id = self.widget.after(self.interval_ms - elapsed_ms % self.interval_ms, self.tick)
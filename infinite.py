@@ -0,0 +1,195 @@
+import hashlib
+import os
+import random
+import sqlite3
+import tempfile
+import zlib
+from collections import OrderedDict, deque
+
+# Endless board for the endless game mode
+# The board is split into 32x32 chunks. A chunk's mines come from a hash of (seed, chunk row, chunk column),
+# so they are made the first time the chunk is looked at and can be made again at any time.
+# Only what the player did (revealed and flagged cells) has to be kept. Chunks that have not been used lately
+# are written to a SQLite file and dropped from memory, so memory stays flat however far the player goes.
+# The cells around (0, 0) never hold a mine, so the game can always start there.
+
+chunk_size = 32
+chunk_cells = chunk_size * chunk_size
+
+
+class InfiniteBoard:
+    def __init__(self, seed=0, density=0.18, path=None, max_chunks=256, max_mine_layers=512, max_cascade=100_000):
+        # Below this a single click could open an area with no end
+        if not 0.15 <= density < 1:
+            raise ValueError(f"density must be between 0.15 and 1, got {density}")
+        self.seed = seed
+        self.density = density
+        # Cells opened by one click at most; cells past this stay closed and can be clicked later
+        self.max_cascade = max_cascade
+        self.max_chunks = max_chunks
+        self.max_mine_layers = max_mine_layers
+        # Mine layers of recently used chunks; these can always be made again
+        self.mine_layers = OrderedDict()
+        # Revealed and flagged layers of recently used chunks
+        self.chunks = OrderedDict()
+        # Chunks in memory that have a row on disk
+        self.stored = set()
+        self.lost = False
+        self.revealed_count = 0
+        self.flag_count = 0
+
+        # Chunks dropped from memory go to disk
+        self.temporary = path is None
+        if path is None:
+            handle, path = tempfile.mkstemp(prefix="minesweeper-endless-", suffix=".db")
+            os.close(handle)
+        self.path = path
+        self.store = sqlite3.connect(path)
+        self.store.execute("CREATE TABLE IF NOT EXISTS chunks (chunk_row INTEGER, chunk_col INTEGER, "
+                           "revealed BLOB, flagged BLOB, PRIMARY KEY (chunk_row, chunk_col))")
+
+    # Makes the mine layer of a chunk from the seed and its position
+    def make_mines(self, chunk_row, chunk_col):
+        digest = hashlib.blake2b(f"{self.seed},{chunk_row},{chunk_col}".encode(), digest_size=8).digest()
+        rng = random.Random(int.from_bytes(digest, "little"))
+        density = self.density
+        mines = bytearray(rng.random() < density for _ in range(chunk_cells))
+        # Keeping the 3x3 area around (0, 0) clear
+        for row in (-1, 0, 1):
+            for col in (-1, 0, 1):
+                if (row // chunk_size, col // chunk_size) == (chunk_row, chunk_col):
+                    mines[(row % chunk_size) * chunk_size + col % chunk_size] = 0
+        return mines
+
+    def chunk_mines(self, chunk_row, chunk_col):
+        key = (chunk_row, chunk_col)
+        mines = self.mine_layers.get(key)
+        if mines is None:
+            mines = self.make_mines(chunk_row, chunk_col)
+            self.mine_layers[key] = mines
+            if len(self.mine_layers) > self.max_mine_layers:
+                self.mine_layers.popitem(last=False)
+        else:
+            self.mine_layers.move_to_end(key)
+        return mines
+
+    # Revealed and flagged layers of a chunk, loading it from disk or starting it empty
+    def chunk_state(self, chunk_row, chunk_col):
+        key = (chunk_row, chunk_col)
+        state = self.chunks.get(key)
+        if state is not None:
+            self.chunks.move_to_end(key)
+            return state
+        row = self.store.execute("SELECT revealed, flagged FROM chunks WHERE chunk_row = ? AND chunk_col = ?",
+                                 key).fetchone()
+        if row is None:
+            state = (bytearray(chunk_cells), bytearray(chunk_cells))
+        else:
+            state = (bytearray(zlib.decompress(row[0])), bytearray(zlib.decompress(row[1])))
+            self.stored.add(key)
+        self.chunks[key] = state
+        self.evict()
+        return state
+
+    # Writes the least recently used chunks to disk until only max_chunks are in memory
+    def evict(self):
+        while len(self.chunks) > self.max_chunks:
+            key, (revealed, flagged) = self.chunks.popitem(last=False)
+            stored = key in self.stored
+            self.stored.discard(key)
+            # Chunks nobody has touched are not worth a row; they start empty again anyway
+            if any(revealed) or any(flagged):
+                with self.store:
+                    self.store.execute("INSERT OR REPLACE INTO chunks VALUES (?, ?, ?, ?)",
+                                       (*key, zlib.compress(bytes(revealed)), zlib.compress(bytes(flagged))))
+            # A chunk emptied since it was loaded (its last flag taken away) loses its row,
+            # or the old row would bring the flag back next time
+            elif stored:
+                with self.store:
+                    self.store.execute("DELETE FROM chunks WHERE chunk_row = ? AND chunk_col = ?", key)
+
+    # Splits a cell position into (chunk row, chunk column, index inside the chunk)
+    @staticmethod
+    def locate(row, col):
+        return row // chunk_size, col // chunk_size, (row % chunk_size) * chunk_size + col % chunk_size
+
+    def is_mine(self, row, col):
+        chunk_row, chunk_col, i = self.locate(row, col)
+        return self.chunk_mines(chunk_row, chunk_col)[i] == 1
+
+    def is_revealed(self, row, col):
+        chunk_row, chunk_col, i = self.locate(row, col)
+        return self.chunk_state(chunk_row, chunk_col)[0][i] == 1
+
+    def is_flagged(self, row, col):
+        chunk_row, chunk_col, i = self.locate(row, col)
+        return self.chunk_state(chunk_row, chunk_col)[1][i] == 1
+
+    # Number of mines around a cell
+    def count(self, row, col):
+        return sum(self.is_mine(r, c) for r in (row-1, row, row+1) for c in (col-1, col, col+1)
+                   if r != row or c != col)
+
+    # What a cell shows: None while hidden, "F" for a flag, "X" for a mine, otherwise its number
+    def value(self, row, col):
+        chunk_row, chunk_col, i = self.locate(row, col)
+        revealed, flagged = self.chunk_state(chunk_row, chunk_col)
+        if flagged[i]:
+            return "F"
+        if not revealed[i]:
+            return None
+        if self.chunk_mines(chunk_row, chunk_col)[i]:
+            return "X"
+        return self.count(row, col)
+
+    # Reveals a cell and, if it is a 0, every connected cell around it
+    # Returns the list of (row, col) cells that were newly revealed
+    def reveal(self, row, col):
+        if self.lost or self.is_revealed(row, col) or self.is_flagged(row, col):
+            return []
+        opened = []
+        queue = deque([(row, col)])
+        chunk_row, chunk_col, i = self.locate(row, col)
+        self.chunk_state(chunk_row, chunk_col)[0][i] = 1
+        while queue and len(opened) < self.max_cascade:
+            row, col = queue.popleft()
+            opened.append((row, col))
+            if self.is_mine(row, col):
+                self.lost = True
+                break
+            if self.count(row, col) != 0:
+                continue
+            for r in (row-1, row, row+1):
+                for c in (col-1, col, col+1):
+                    chunk_row, chunk_col, i = self.locate(r, c)
+                    revealed, flagged = self.chunk_state(chunk_row, chunk_col)
+                    if not revealed[i] and not flagged[i]:
+                        revealed[i] = 1
+                        queue.append((r, c))
+        # Cells queued past the cascade limit go back to being hidden
+        for row, col in queue:
+            chunk_row, chunk_col, i = self.locate(row, col)
+            self.chunk_state(chunk_row, chunk_col)[0][i] = 0
+        self.revealed_count += len(opened)
+        return opened
+
+    # Places or takes away a flag; returns True if the cell changed
+    def toggle_flag(self, row, col):
+        chunk_row, chunk_col, i = self.locate(row, col)
+        revealed, flagged = self.chunk_state(chunk_row, chunk_col)
+        if self.lost or revealed[i]:
+            return False
+        flagged[i] ^= 1
+        self.flag_count += 1 if flagged[i] else -1
+        return True
+
+    # Chunks held in memory and chunks written to disk
+    def stats(self):
+        on_disk = self.store.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+        return {"chunks_in_memory": len(self.chunks), "mine_layers_in_memory": len(self.mine_layers),
+                "chunks_on_disk": on_disk}
+
+    def close(self):
+        self.store.close()
+        if self.temporary:
+            os.remove(self.path)
@@ -0,0 +1,192 @@
+import atexit
+import cProfile
+import csv
+import functools
+import json
+import os
+import time
+
+# Opt-in timing of the game's hot paths, for finding where the time between a click and the board updating goes
+# Nothing is wrapped unless install() is called, so with instrumentation off the game runs exactly as normal
+# Turned on with `python main.py --profile report.json` or MINESWEEPER_PROFILE=report.json;
+# the report is written when the program exits, in a format picked by the file extension:
+#   .json   latency histogram and percentiles per timed function, and counters
+#   .csv    the same, one row per timed function
+#   .prof   a cProfile of the whole run instead, for pstats or snakeviz
+
+env_var = "MINESWEEPER_PROFILE"
+profile_extensions = (".prof", ".pstats")
+
+# Timings are put in power-of-two buckets starting at 1024ns (about 1us)
+_first_bucket_bits = 10
+
+
+class Histogram:
+    __slots__ = ("count", "total", "low", "high", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.low = None
+        self.high = 0
+        self.buckets = [0] * 40
+
+    def add(self, ns):
+        self.count += 1
+        self.total += ns
+        if self.low is None or ns < self.low:
+            self.low = ns
+        if ns > self.high:
+            self.high = ns
+        self.buckets[min(39, max(0, ns.bit_length() - _first_bucket_bits))] += 1
+
+    # Upper end of the bucket holding the q-th fraction of timings, in nanoseconds
+    def percentile(self, q):
+        seen = 0
+        for k, count in enumerate(self.buckets):
+            seen += count
+            if seen >= q * self.count:
+                return min(1 << (k + _first_bucket_bits), self.high)
+        return self.high
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "total_ms": self.total / 1e6,
+            "mean_us": self.total / self.count / 1e3 if self.count else 0.0,
+            "min_us": (self.low or 0) / 1e3,
+            "p50_us": self.percentile(0.5) / 1e3,
+            "p90_us": self.percentile(0.9) / 1e3,
+            "p99_us": self.percentile(0.99) / 1e3,
+            "max_us": self.high / 1e3,
+            # Bucket upper end in microseconds -> number of timings, leaving out empty buckets
+            "histogram": {f"{(1 << (k + _first_bucket_bits)) / 1e3:g}": count
+                          for k, count in enumerate(self.buckets) if count},
+        }
+
+
+enabled = False
+timings = {}
+counters = {}
+# Clock reading at the last click, for timing how long the board takes to catch up with it
+last_input_ns = None
+
+
+def record(label, ns):
+    histogram = timings.get(label)
+    if histogram is None:
+        histogram = timings[label] = Histogram()
+    histogram.add(ns)
+
+
+def count(label, amount=1):
+    counters[label] = counters.get(label, 0) + amount
+
+
+# Returns function wrapped so every call is timed under label
+# count_items also adds the length of what it returns to a counter, e.g. the cells a reveal opened
+def timed(function, label, count_items=False):
+    clock = time.perf_counter_ns
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = clock()
+        result = function(*args, **kwargs)
+        record(label, clock() - start)
+        if count_items:
+            count(f"{label}.items", len(result))
+        return result
+    wrapper.__wrapped_by_instrument__ = True
+    return wrapper
+
+
+# Replaces owner.name (a function on a module or class) with a timed version
+def wrap(owner, name, label=None, count_items=False):
+    function = getattr(owner, name)
+    if getattr(function, "__wrapped_by_instrument__", False):
+        return
+    label = label or f"{getattr(owner, '__name__', owner)}.{name}"
+    setattr(owner, name, timed(function, label, count_items))
+
+
+# Times a click from the mouse event to the end of the canvas update that shows it
+def _wrap_board_canvas(renderer):
+    bind_click = renderer.BoardCanvas.bind_click
+    flush = renderer.BoardCanvas.flush
+
+    def timed_bind_click(self, button, function):
+        def clicked(*args):
+            global last_input_ns
+            last_input_ns = time.perf_counter_ns()
+            function(*args)
+        bind_click(self, button, timed(clicked, f"click.button{button}"))
+
+    def timed_flush(self):
+        global last_input_ns
+        flush(self)
+        if last_input_ns is not None:
+            record("click_to_canvas_update", time.perf_counter_ns() - last_input_ns)
+            last_input_ns = None
+
+    renderer.BoardCanvas.bind_click = timed_bind_click
+    renderer.BoardCanvas.flush = timed(timed_flush, "BoardCanvas.flush")
+
+
+# Turns instrumentation on for the rest of the run and writes the report to path on exit
+# (with write_at_exit=False the caller writes it with write_report(); cProfile output is always written on exit)
+def install(path, write_at_exit=True):
+    global enabled
+    if enabled:
+        return
+    enabled = True
+    if path.endswith(profile_extensions):
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        def write_profile():
+            profiler.disable()
+            profiler.dump_stats(path)
+        atexit.register(write_profile)
+        return
+
+    import engine
+    import leaderboard
+    import renderer
+    wrap(engine.Board, "place_mines")
+    wrap(engine.Board, "reveal_cells", count_items=True)
+    wrap(engine.Board, "left_click")
+    wrap(engine.Board, "right_click")
+    wrap(engine.Board, "check_win")
+    for name in ("import_text", "save_time", "flush", "top_times"):
+        wrap(leaderboard.Leaderboard, name)
+    _wrap_board_canvas(renderer)
+    if write_at_exit:
+        atexit.register(write_report, path)
+
+
+# Calls install() if the environment variable asks for it; returns True if instrumentation is on
+def install_from_env():
+    path = os.environ.get(env_var)
+    if path:
+        install(path)
+    return enabled
+
+
+def report():
+    return {"timings": {label: histogram.summary() for label, histogram in sorted(timings.items())},
+            "counters": dict(sorted(counters.items()))}
+
+
+def write_report(path):
+    data = report()
+    with open(path, "w", newline="") as file:
+        if path.endswith(".csv"):
+            fields = ["label", "count", "total_ms", "mean_us", "min_us", "p50_us", "p90_us", "p99_us", "max_us"]
+            writer = csv.writer(file)
+            writer.writerow(fields)
+            for label, summary in data["timings"].items():
+                writer.writerow([label] + [summary[field] for field in fields[1:]])
+            for label, value in data["counters"].items():
+                writer.writerow([label, value])
+        else:
+            json.dump(data, file, indent=2)
@@ -0,0 +1,122 @@
+import os
+import sqlite3
+import sys
+from contextlib import contextmanager
+
+# Leaderboard stored in SQLite with an index on (difficulty, time),
+# so the fastest times for a difficulty come straight off the index instead of reading and sorting every result
+# The database runs in WAL mode, so several game processes can share it: writers queue on SQLite's lock
+# instead of interleaving lines, and readers never block them
+
+# How hard each commit tries to reach the disk
+# "off" leaves it to the OS, "normal" survives a crashed process, "full" also survives a power cut
+durability_levels = {"off": "OFF", "normal": "NORMAL", "full": "FULL"}
+
+
+class Leaderboard:
+    def __init__(self, path="leaderboard.db", text_path=None, batch_size=1, durability="normal", timeout=30.0):
+        if durability not in durability_levels:
+            raise ValueError(f"durability must be one of {', '.join(durability_levels)}, got {durability!r}")
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be at least 1, got {batch_size}")
+        self.path = path
+        self.batch_size = batch_size
+        # Results waiting to be written in the next batch
+        self.pending = []
+
+        # Transactions are started by hand (see _write) so every write takes the lock up front
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(f"PRAGMA synchronous={durability_levels[durability]}")
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS times (
+                id INTEGER PRIMARY KEY,
+                difficulty TEXT NOT NULL,
+                name TEXT NOT NULL,
+                time REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS times_by_difficulty ON times (difficulty, time);
+            CREATE TABLE IF NOT EXISTS imported (path TEXT PRIMARY KEY);
+        """)
+        # Bringing in the old leaderboard.txt the first time this database is opened
+        if text_path is not None:
+            self.import_text(text_path)
+
+    # Runs the statements inside it as one transaction that holds the write lock from the start
+    @contextmanager
+    def _write(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    # Adds the results from a "difficulty,name,time" text file, once per file
+    # Lines that are not in that form are skipped, with a warning saying which ones
+    # Returns the number of results added
+    def import_text(self, text_path):
+        key = os.path.abspath(text_path)
+        if not os.path.exists(text_path):
+            return 0
+        # Once a file is imported it is not read again, so opening the leaderboard stays quick however long it is
+        if self.connection.execute("SELECT 1 FROM imported WHERE path = ?", (key,)).fetchone():
+            return 0
+
+        rows = []
+        skipped = []
+        with open(text_path, "r") as f:
+            for number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                # Names may contain commas, so the difficulty is the first field and the time is the last
+                try:
+                    difficulty, rest = line.split(",", 1)
+                    name, time_taken = rest.rsplit(",", 1)
+                    rows.append((difficulty, name, float(time_taken)))
+                except ValueError:
+                    skipped.append(number)
+        if skipped:
+            lines = ", ".join(map(str, skipped[:10])) + (", ..." if len(skipped) > 10 else "")
+            print(f"Skipped {len(skipped)} malformed line(s) of {text_path}: {lines}", file=sys.stderr)
+
+        # Checking again inside the transaction, so two processes opening a new database cannot both import the file
+        with self._write() as connection:
+            if connection.execute("SELECT 1 FROM imported WHERE path = ?", (key,)).fetchone():
+                return 0
+            connection.executemany("INSERT INTO times (difficulty, name, time) VALUES (?, ?, ?)", rows)
+            connection.execute("INSERT INTO imported (path) VALUES (?)", (key,))
+        return len(rows)
+
+    # Saves one result, writing it out once batch_size results are waiting
+    def save_time(self, difficulty, name, time_taken):
+        self.pending.append((difficulty, name, time_taken))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    # Writes every waiting result in a single transaction
+    def flush(self):
+        if not self.pending:
+            return
+        with self._write() as connection:
+            connection.executemany("INSERT INTO times (difficulty, name, time) VALUES (?, ?, ?)", self.pending)
+        self.pending = []
+
+    # Returns the fastest times for a difficulty as a list of (time, name), fastest first
+    def top_times(self, difficulty, count=5):
+        # Writing our own waiting results first so they show up
+        self.flush()
+        return self.connection.execute(
+            "SELECT time, name FROM times WHERE difficulty = ? ORDER BY time LIMIT ?",
+            (difficulty, count)).fetchall()
+
+    # Returns every result as a list of (difficulty, name, time)
+    def all_times(self):
+        self.flush()
+        return self.connection.execute("SELECT difficulty, name, time FROM times ORDER BY id").fetchall()
+
+    def close(self):
+        self.flush()
+        self.connection.close()
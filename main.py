@@ -1,13 +1,25 @@
 import tkinter as tk
 import tkinter.font as tkfont
+import argparse
 import random
-import time
-import math
-
-# Creating main window
-root = tk.Tk()
-root.title("Minesweeper")
-root.geometry("800x600")
+import os
+import sys
+
+import animation
+import board_pool
+import engine
+import fonts
+import game_timer
+import infinite
+import instrument
+import leaderboard
+import probability
+import renderer
+import replay
+import savegame
+
+# Importing this module only defines the game; main() opens the window, the fonts, the leaderboard and the board pool
+# Usage: python main.py [--profile report.json|report.csv|run.prof]
 
 # Initializing Variables
 instructions = "1. Click on a cell to reveal what's underneath.\n" \
@@ -16,28 +28,18 @@ instructions = "1. Click on a cell to reveal what's underneath.\n" \
                "4. Use the numbers to deduce where the mines are located.\n" \
                "5. Right-click on a cell to flag it as a mine. This helps you keep track of where you think the mines are located.\n" \
                "6. Right-click on a cell that already has a flag to remove the flag.\n" \
-               "7. Win the game by flagging all cells that contain mines.\n" \
+               "7. Win the game by flagging all cells that contain mines, or by revealing every cell that does not.\n" \
                "\n" \
                "Good luck!"
 
-title_font = tkfont.Font(family="Bungee", size=30)
-difficulty_font = tkfont.Font(family="Bungee", size=24)
-default_font = tkfont.Font(family="Bungee", size=12)
-small_font = tkfont.Font(family="Bungee", size=10)
-
-easy_rows = 9
-easy_columns = 9
-easy_mines = 10
+# Difficulty presets come from the board engine so headless tools use the same sizes
+easy_rows, easy_columns, easy_mines = engine.difficulties["Easy"]
 easy_flags = easy_mines
 
-medium_rows = 16
-medium_columns = 16
-medium_mines = 40
+medium_rows, medium_columns, medium_mines = engine.difficulties["Medium"]
 medium_flags = medium_mines
 
-hard_rows = 16
-hard_columns = 30
-hard_mines = 99
+hard_rows, hard_columns, hard_mines = engine.difficulties["Hard"]
 hard_flags = hard_mines
 
 bg_color = "#ABC4AA"
@@ -61,40 +63,75 @@ button_bg_color = "#539165"
 timer_color = "#060047"
 button_highlight_color = "#e5ffe5"
 cell_highlight_color = "#c1ffc1"
+hint_color = "#5c5c5c"
+
+# Main window and fonts, created by setup()
+root = None
+title_font = None
+difficulty_font = None
+default_font = None
+small_font = None
+
+# Local leaderboard and the pool of ready-made boards, opened by setup()
+scores = None
+boards = None
+
+# Timer for the game being played
+timer = None
+
+# Board for the endless game mode
+endless_board = None
+
+# Save file of the game in progress and the replay recorded so far, kept so the game can be resumed after quitting
+save_path = "savegame.bin"
+save_replay_path = "savegame.replay"
+save = None
+
+# Screens are built the first time they are shown and kept, so showing one again only swaps frames
+# Each entry is (frame, refresh), where refresh brings the screen up to date every time it is shown
+screens = {}
+current_screen = None
+
+# Board canvases of the game screen, one per board size, reused from game to game
+board_views = {}
+
+
+# Shows a screen, building it first if it has not been shown before
+# build() returns (frame, refresh); refresh is called with args, or is None for screens that never change
+def show_screen(name, build, *args):
+    global current_screen
+    if name not in screens:
+        screens[name] = build()
+    frame, refresh = screens[name]
+    if refresh is not None:
+        refresh(*args)
+    if current_screen is not frame:
+        if current_screen is not None:
+            current_screen.pack_forget()
+        frame.pack(expand=True, fill=tk.BOTH)
+        current_screen = frame
 
 
 # Game functions
 # Saves time to local leaderboard
 def save_time(difficulty, time_taken):
     global player_name
-    with open("leaderboard.txt", "a") as f:
-        f.write(f"{difficulty},{player_name},{time_taken}\n")
+    scores.save_time(difficulty, player_name, time_taken)
 
 # Gets top 5 times for a given difficulty
 def get_top_times(difficulty):
-    times = []
-    # Opening leaderboard file
-    with open("leaderboard.txt", "r") as f:
-        for line in f:
-            line = line.strip()
-            # Finding times associated with current difficulty
-            if line.startswith(difficulty):
-                _, name, time_taken = line.split(",")
-                times.append((float(time_taken), name))
     # Ranking 5 lowest times
-    top_times = sorted(times)[:5]
+    top_times = scores.top_times(difficulty, 5)
     ranked_times = [f"{i+1}. {name}: {time_taken:.2f}\n" for i, (time_taken, name) in enumerate(top_times)]
     return ranked_times
 
 # Function to show Leaderboard
 def show_leaderboard(difficulty):
-    # Clears current frame
-    for widget in root.winfo_children():
-        widget.destroy()
-    
+    show_screen("leaderboard", build_leaderboard, difficulty)
+
+def build_leaderboard():
     # Create a new frame
     leaderboard_frame = tk.Frame(root, bg=bg_color)
-    leaderboard_frame.pack(expand=True, fill=tk.BOTH)
     leaderboard_frame.grid_rowconfigure(0, weight=1)
     leaderboard_frame.grid_rowconfigure(1, weight=3)
     leaderboard_frame.grid_rowconfigure(2, weight=1)
@@ -105,11 +142,11 @@ def show_leaderboard(difficulty):
     leaderboard_frame.grid_columnconfigure(2, weight=1)
 
     # Creates a label
-    leaderboard_label = tk.Label(leaderboard_frame, text=f"{difficulty}:", font=title_font, bg=bg_color, foreground=text_color)
+    leaderboard_label = tk.Label(leaderboard_frame, font=title_font, bg=bg_color, foreground=text_color)
     leaderboard_label.grid(row=0, column=1)
 
     # Top 5 fastest times label
-    fastest_times = tk.Label(leaderboard_frame, text="".join(str(t) for t in get_top_times(difficulty)), font=default_font, bg=bg_color, foreground=text_color)
+    fastest_times = tk.Label(leaderboard_frame, font=default_font, bg=bg_color, foreground=text_color)
     fastest_times.grid(row=1, column=1)
 
     # Creating new name button
@@ -124,41 +161,31 @@ def show_leaderboard(difficulty):
     quit_button = tk.Button(leaderboard_frame, text="Quit", font=small_font, command=root.quit, bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
     quit_button.grid(row=3, column=0)
 
+    # Showing the times for the difficulty asked for
+    def refresh(difficulty):
+        leaderboard_label.config(text=f"{difficulty}:")
+        fastest_times.config(text="".join(str(t) for t in get_top_times(difficulty)))
+
+    return leaderboard_frame, refresh
+
 # Game over function
 def game_over():
-    # Stopping update_time function
-    global timer_running
-    timer_running = False
-
-    # Clearing window
-    for widget in root.winfo_children():
-        widget.destroy()
-    
+    # Stopping the timer
+    global elapsed_time
+    if timer is not None:
+        elapsed_time = timer.stop()
+
+    show_screen("game over", build_game_over)
+
+def build_game_over():
     # Create a new frame
     game_over_frame = tk.Frame(root, bg=bg_color)
-    game_over_frame.pack(expand=True, fill=tk.BOTH)
 
-    # Explosion animation
+    # Explosion animation, which stops when the screen is hidden
     explosion_canvas = tk.Canvas(game_over_frame, width=800, height=200, bg=bg_color, highlightthickness=0)
     explosion_canvas.pack(expand=True, fill=tk.BOTH)
-
-    def explode(x, y, r, color):
-        text_size = 50 + (10 // 50)
-        explosion_canvas.create_text(100, 100, text="BOOM!", font=("Impact", text_size), fill="black")
-        if r < 800:
-            explosion_colors = ["orange", "yellow", "red", "white"]
-            for i in range(4):
-                explosion_canvas.create_oval(x-r, y-r, x+r, y+r, outline=explosion_colors[i], width=5)
-                explosion_canvas.create_oval(x-r-i*5, y-r-i*5, x+r+i*5, y+r+i*5, outline=explosion_colors[i], width=5)
-            for i in range(12):
-                angle = math.radians(i*30)
-                cx = x + (r-30) * math.cos(angle)
-                cy = y - (r-30) * math.sin(angle)
-                explosion_canvas.create_polygon(x, y, cx-15, cy-15, cx, cy, cx+15, cy-15, fill="yellow", outline="white", width=3)
-            explosion_canvas.after(20, explode, x, y, r+20, color)
-
-    
-    explode(100, 100, 10, 'orange')
+    explosion = animation.Explosion(explosion_canvas, 100, 100, ("Impact", 50))
+    game_over_frame.bind("<Unmap>", lambda event: explosion.stop())
 
     # Game over label
     game_over_label = tk.Label(game_over_frame, text="Game Over", font=title_font, bg=bg_color, fg=text_color)
@@ -172,25 +199,32 @@ def game_over():
     quit_button = tk.Button(game_over_frame, text="Quit", font=small_font, command=root.destroy, bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
     quit_button.pack(pady=10)
 
+    # Playing the explosion again from the start
+    def refresh():
+        explosion.start()
+
+    return game_over_frame, refresh
+
 # Victory function
-def victory(frame, difficulty):
-    # Stopping update_time function
-    global timer_running
-    timer_running = False
+def victory(difficulty):
+    # Stopping the timer and storing the exact time taken
+    global elapsed_time
+    elapsed_time = timer.stop()
 
     # Saves time to leaderboard
     save_time(difficulty, elapsed_time)
 
-    # Clearing frame
-    for widget in frame.winfo_children():
-        widget.destroy()
+    show_screen("victory", build_victory, difficulty)
+
+def build_victory():
+    frame = tk.Frame(root, bg=bg_color)
 
     # Creating congratulations label
     congrats_label = tk.Label(frame, text="Congratulations, you won!", font=title_font, bg=bg_color, fg=text_color)
     congrats_label.pack(pady=10)
 
     # Creating time taken label
-    time_label = tk.Label(frame, text=f"Time taken: {elapsed_time:.2f} seconds", font=default_font, bg=bg_color, fg=timer_color)
+    time_label = tk.Label(frame, font=default_font, bg=bg_color, fg=timer_color)
     time_label.pack(pady=10)
 
     # Creating new name button
@@ -202,176 +236,213 @@ def victory(frame, difficulty):
     play_again_button.pack(pady=10)
 
     # Creating view leaderboard button
-    leaderboard_button = tk.Button(frame, text="View Leaderboard",font=small_font, command=lambda: show_leaderboard(difficulty), bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
+    leaderboard_button = tk.Button(frame, text="View Leaderboard",font=small_font, bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
     leaderboard_button.pack(pady=10)
 
     # Creating Quit button
     quit_button = tk.Button(frame, text="Quit", font=small_font, command=root.quit, bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
     quit_button.pack(pady=10)
 
+    # Showing the time of the game just won
+    def refresh(difficulty):
+        time_label.config(text=f"Time taken: {elapsed_time:.2f} seconds")
+        leaderboard_button.config(command=lambda: show_leaderboard(difficulty))
+
+    return frame, refresh
+
 # Creating game board
-def create_board(rows, cols, mines, flags, frame, difficulty):
+# layout is a ready-made board from the pool, and saved a game picked up by resume_game() as (save file, board, replay so far)
+def create_board(rows, cols, mines, flags, frame, difficulty, layout=None, saved=None):
     global flags_left
     flags_left = flags
     global first_click
     first_click = True
+    # A board from the pool shows its opening before the player has done anything,
+    # so its timer waits for the player's first move, as a normal board's waits for the first click
+    global timer_waiting
+    timer_waiting = False
+    global save
+
+    if saved is None:
+        # The board engine keeps track of mines, cell values, revealed cells and flags
+        # Every game gets its own seed, so its replay can place the same mines again
+        seed = random.getrandbits(63) if layout is None else None
+        engine_board = engine.Board(rows, cols, mines, flags, seed=seed)
+
+        # Recording every move, so the game can be replayed to check its time
+        recorder = replay.Recorder(rows, cols, mines, flags, difficulty, player_name, seed=seed,
+                                   layout=None if layout is None else layout[2])
+
+        # Saving the game after every move, so it can be resumed after quitting
+        if save is not None:
+            save.close()
+        save = savegame.create(save_path, engine_board)
+    else:
+        # Picking up a saved game where it was left, as resume_game() loaded it
+        save, engine_board, recorder = saved
+    recorder.save_progress(save_replay_path)
+
+    # Writing the cells a move changed to the save file and the move to the replay so far
+    def save_move(cells):
+        save.update(engine_board, cells, timer.elapsed)
+        recorder.save_progress(save_replay_path)
+
+    # Saving the replay once the game is over, and removing the save since there is nothing left to resume
+    def save_replay():
+        global save
+        recorder.save("replays", elapsed_time)
+        save.close()
+        save = None
+        savegame.remove(save_path)
+        savegame.remove(save_replay_path)
 
     # Function for placing mines/assigning cell values
-    def place_mines(board, rows, cols, mines, click_row, click_col):
-        count = 0
-        # Randomly placing mines
-        while count < mines:
-            row = random.randint(0, rows - 1)
-            col = random.randint(0, cols - 1)
-            # Will not allow mines to be placed within two cells of the first click or on another mine
-            if (board[row][col] != "X") and ((abs(row - click_row) > 1) or (abs(col - click_col) > 1)):
-                board[row][col] = "X"
-                count += 1
-        
-        # Calculating each cells value
-        for row in range(rows):
-            for col in range(cols):
-                if board[row][col] != "X":
-                    num_mines = 0
-                    for r in range(max(0, row-1), min(rows, row+2)):
-                        for c in range(max(0, col-1), min(cols, col+2)):
-                            if board[r][c] == "X":
-                                num_mines += 1
-                    board[row][col] = num_mines
-        # Starts timer and returns the board with each cell having a value or mine
-        global start_timer
-        start_timer()
-        return board
-
-    # Function for revealing cells
-    def reveal_cells(row, col):
-        button = buttons[row][col]
-        global value
-        value = values[row][col]
-        button.config(text=value, bg=clicked_cell_color, fg=mine_text_colors[value])
-        button.config(relief=tk.SUNKEN)
-
-        # Stopping recursion if cell has a non-zero value
-        if value != 0:
-            return
+    def place_mines(click_row, click_col):
+        engine_board.place_mines(click_row, click_col)
+        # Starts timer once the board has each cell with a value or mine
+        timer.start()
+        save.write_mines(engine_board, timer.elapsed)
+
+    # Starts the timer of a board from the pool, which waits for the player's first move
+    def start_waiting_timer():
+        global timer_waiting
+        if timer_waiting:
+            timer_waiting = False
+            timer.start()
+
+    # Hint mode shows the chance of a mine on every hidden cell
+    hints = probability.MineProbabilities(engine_board)
+    global hints_on
+    hints_on = False
+
+    # Redraws the hints after a move, if hint mode is on
+    def refresh_hints():
+        if hints_on and not engine_board.lost and not engine_board.won:
+            board_view.show_hints(hints.compute(), str(small_font), hint_color)
+
+    # Turns hint mode on or off
+    global toggle_hints
+    def toggle_hints():
+        global hints_on
+        hints_on = not hints_on
+        if hints_on:
+            refresh_hints()
+        else:
+            board_view.clear_hints()
+
+    # Shows a revealed cell on the board
+    def show_cell(i):
+        value = engine_board.value(*engine_board.position(i))
+        board_view.draw_cell(i, value, clicked_cell_color, mine_text_colors[value])
 
-        # recursively reveal adjacent cells with value 0
-        for r in range(max(0, row-1), min(rows, row+2)):
-            for c in range(max(0, col-1), min(cols, col+2)):
-                if buttons[r][c]["text"] == "" and (r != row or c != col):
-                    reveal_cells(r, c)
-    
     # Left click function
-    def left_click(event):
-        button = event.widget
-        # if the button has not been clicked before
-        if button["text"] == "":
-            row = int(button.grid_info()["row"])
-            col = int(button.grid_info()["column"])
+    def left_click(row, col):
+        i = engine_board.index(row, col)
 
+        # if the button has not been clicked before
+        if not engine_board.revealed[i] and not engine_board.flagged[i]:
+            start_waiting_timer()
             # If it is the first click the program places mines
             global first_click
             if first_click == True:
-                global values
-                values = place_mines(board, rows, cols, mines, row, col)
-                first_click = False 
+                place_mines(row, col)
+                first_click = False
 
-            # Getting the value of the clicked cell
-            value = values[row][col]
+            opened = engine_board.left_click(row, col)
+            recorder.record(i, "reveal", timer.elapsed)
+            save_move(opened)
 
             # If the user clicked a mine
-            if value == "X":
-                button.config(text="X", bg="red")
+            if engine_board.lost:
+                board_view.draw_cell(i, "X", "red", mine_text_colors["X"])
                 game_over()
+                save_replay()
 
-            # If the user clicked an empty cell
-            elif value == 0:
-                reveal_cells(row, col)
-            
-            # If the user clicked a cell with adjacent mines
+            # Otherwise the cell (and any empty cells around it) are revealed
             else:
-                button.config(text=value, bg=clicked_cell_color, fg=mine_text_colors[value])
-                button.config(relief=tk.SUNKEN)
-    
-    # Function for checking if the user has flagged all mines
-    def check_win(frame):
-        # Iterates over each cell and finds if all mines have a flag over them
-        for row in range(rows):
-            for col in range(cols):
-                button = buttons[row][col]
-                value = values[row][col]
-                if value == "X" and button["text"] != "F":
-                    return False
-                elif value != "X" and button["text"] == "F":
-                    return False
-                else:
-                    victory(frame, difficulty)
-                    return True
-    
+                for cell in opened:
+                    show_cell(cell)
+                if not check_win():
+                    refresh_hints()
+
+    # Function for checking if the user has won, either by flagging all mines or revealing every safe cell
+    def check_win():
+        if engine_board.check_win():
+            victory(difficulty)
+            save_replay()
+            return True
+        return False
+
     # Right click function
-    def right_click(event):
+    def right_click(row, col):
         global flags_left
-        button = event.widget
-
-        # If there is no flag program places one until the user is out of flags which triggers the check win function
-        if (button["text"] == "") and (flags_left != 0):
-            button["text"] = "F"
-            button["foreground"] = flag_color
-            flags_left = flags_left - 1
-            if flags_left == 0:
-                check_win(frame)
-
-        # If a flag is present the program takes it away
-        elif button["text"] == "F":
-            button["text"] = ""
-            button["foreground"] = mine_text_colors[value]
-            flags_left = flags_left + 1
+        i = engine_board.index(row, col)
+
+        # If there is no flag program places one until the user is out of flags
+        start_waiting_timer()
+        if engine_board.right_click(row, col):
+            recorder.record(i, "flag", timer.elapsed)
+            save_move([i])
+            flags_left = engine_board.flags_left
+            if engine_board.flagged[i]:
+                board_view.draw_cell(i, "F", unclicked_cell_color, flag_color)
+
+            # If a flag is present the program takes it away
+            else:
+                board_view.draw_cell(i, "", unclicked_cell_color)
+            if not check_win():
+                refresh_hints()
 
         # Program calls for the flag label to be updated
         update_flags_left()
-  
-    # Creating the board
-    global board
-    board = []
-    for i in range(rows):
-        row = [0] * cols
-        board.append(row)
-
-    # Creating a button for each cell which have a command for left and right clicks
-    buttons = []
-    for row in range(rows):
-        row_buttons = []
-        for col in range(cols):
-            button = tk.Button(frame, text="", font=default_font, width=1, height=1, bg=unclicked_cell_color, highlightbackground=cell_highlight_color, relief=tk.RAISED)
-            button.grid(row=row, column=col, sticky=tk.NSEW)
-            button.bind("<Button-1>", left_click)
-            button.bind("<Button-3>", right_click)
-            row_buttons.append(button)
-        buttons.append(row_buttons)
-
-    # Configuring the frame so the cells are spread evenly
-    for row in range(rows):
-        frame.grid_rowconfigure(row, weight=1)
-
-    for column in range(cols):
-        frame.grid_columnconfigure(column, weight=1)
-
-def game(rows, cols, mines, flags):
-    # Program calculates what difficulty is being played
-    if cols == 9:
-        difficulty = "Easy"
-    elif cols == 16:
-        difficulty = "Medium"
-    elif cols == 30:
-        difficulty = "Hard"
-
-    # Deleting previous frame
-    for widget in root.winfo_children():
-        widget.destroy()
+
+    # Drawing every cell on one canvas, which works out the clicked cell from the mouse position
+    # The canvas for this board size is kept after the game and cleared for the next one
+    board_view = board_views.get((rows, cols))
+    if board_view is None:
+        board_view = renderer.BoardCanvas(frame, rows, cols, default_font, unclicked_cell_color, cell_highlight_color, bg_color)
+        board_views[rows, cols] = board_view
+    else:
+        board_view.reset()
+    for other in board_views.values():
+        if other is not board_view:
+            other.canvas.pack_forget()
+    board_view.bind_click(1, left_click)
+    board_view.bind_click(3, right_click)
+    board_view.pack(expand=True, fill=tk.BOTH)
+
+    # A ready-made board from the pool is shown with its first click already made,
+    # and its timer starts with the player's first move
+    if layout is not None:
+        first_row, first_col, mine_cells = layout
+        engine_board.set_mines(mine_cells)
+        first_click = False
+        save.write_mines(engine_board, timer.elapsed)
+        left_click(first_row, first_col)
+        timer_waiting = True
+
+    # A saved game is drawn as it was left, and its timer carries on from the saved time
+    if saved is not None:
+        for i in range(engine_board.size):
+            if engine_board.revealed[i]:
+                show_cell(i)
+            elif engine_board.flagged[i]:
+                board_view.draw_cell(i, "F", unclicked_cell_color, flag_color)
+        flags_left = engine_board.flags_left
+        update_flags_left()
+        if engine_board.placed:
+            first_click = False
+            timer.start(save.elapsed)
+
+def game(rows, cols, mines, flags, saved=None):
+    show_screen("game", build_game, rows, cols, mines, flags, saved)
+
+def build_game():
+    screen = tk.Frame(root, bg=bg_color)
 
     # Creating/placing top and game frame
-    top_frame = tk.Frame(root, height=40, bg=bg_color)
-    game_frame = tk.Frame(root, bg=bg_color)
+    top_frame = tk.Frame(screen, height=40, bg=bg_color)
+    game_frame = tk.Frame(screen, bg=bg_color)
 
     top_frame.pack(side="top", fill="x")
     game_frame.pack(side="bottom", fill="both", expand=True)
@@ -381,66 +452,158 @@ def game(rows, cols, mines, flags):
     timer_label.pack(side="right")
 
     global flags_label
-    flags_label = tk.Label(top_frame, text=f"Flags: {flags}", font=default_font, bg=bg_color, fg=flag_color)
+    flags_label = tk.Label(top_frame, font=default_font, bg=bg_color, fg=flag_color)
+    flags_label.pack(side="right", padx=10)
+
+    quit_button = tk.Button(top_frame, text="Quit", font=default_font, command=root.destroy, bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
+    quit_button.pack(side="left", padx=10)
+
+    # Hint button, which turns the mine chance overlay on and off
+    hint_button = tk.Button(top_frame, text="Hint", font=default_font, command=lambda: toggle_hints(), bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
+    hint_button.pack(side="left", padx=10)
+
+    # Game timer, which updates the label every second once the game starts
+    def update_timer(elapsed):
+        minutes = int(elapsed / 60)
+        seconds = int(elapsed % 60)
+        timer_label.config(text=f"Time: {minutes:02d}:{seconds:02d}")
+
+    # Starting a new game on the screen
+    def refresh(rows, cols, mines, flags, saved):
+        # Program calculates what difficulty is being played
+        if cols == 9:
+            difficulty = "Easy"
+        elif cols == 16:
+            difficulty = "Medium"
+        elif cols == 30:
+            difficulty = "Hard"
+
+        timer_label.config(text="Time: 0")
+        flags_label.config(text=f"Flags: {flags}")
+
+        # Cancelling the previous game's timer so its refresh cannot keep running
+        global timer
+        if timer is not None:
+            timer.cancel()
+        timer = game_timer.GameTimer(root, update_timer)
+
+        # Create and place game board
+        if saved is None:
+            create_board(rows, cols, mines, flags, game_frame, difficulty, boards.take(difficulty))
+        else:
+            create_board(rows, cols, mines, flags, game_frame, difficulty, saved=saved)
+
+    return screen, refresh
+
+# Updating Flags label
+def update_flags_left():
+    flags_label.config(text=f"Flags left: {flags_left}")
+
+# Resumes the game that was being played when the player last quit
+def resume_game():
+    saved = savegame.open_save(save_path)
+    if saved is None:
+        choose_difficulty()
+        return
+    # A save or replay that was cut short cannot be picked up, so both are thrown away and a new game is started
+    try:
+        engine_board = saved.load()
+        recorder = replay.resume(save_replay_path)
+    except (OSError, ValueError):
+        saved.close()
+        savegame.remove(save_path)
+        savegame.remove(save_replay_path)
+        choose_difficulty()
+        return
+    game(saved.rows, saved.cols, saved.mines, saved.mines, (saved, engine_board, recorder))
+
+# Endless game on a board with no edges, scrolled with the arrow keys
+def endless_game():
+    show_screen("endless", build_endless)
+
+def build_endless():
+    screen = tk.Frame(root, bg=bg_color)
+
+    # Creating/placing top and game frame
+    top_frame = tk.Frame(screen, height=40, bg=bg_color)
+    game_frame = tk.Frame(screen, bg=bg_color)
+
+    top_frame.pack(side="top", fill="x")
+    game_frame.pack(side="bottom", fill="both", expand=True)
+
+    # Creating widgets for top frame
+    cells_label = tk.Label(top_frame, text="Cells: 0", font=default_font, bg=bg_color, fg=timer_color)
+    cells_label.pack(side="right")
+
+    flags_label = tk.Label(top_frame, text="Flags: 0", font=default_font, bg=bg_color, fg=flag_color)
     flags_label.pack(side="right", padx=10)
 
     quit_button = tk.Button(top_frame, text="Quit", font=default_font, command=root.destroy, bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
     quit_button.pack(side="left", padx=10)
 
-    # Updating Flags label
-    global update_flags_left
-    def update_flags_left():
-        flags_label.config(text=f"Flags left: {flags_left}")
-
-    # Game timer functions
-    timer_running = False
-    # Updating timer every second
-    def update_timer():
-        global timer_running, elapsed_time
-        if timer_running == True:
-            elapsed_time = time.time() - start_time
-            minutes = int(elapsed_time / 60)
-            seconds = int(elapsed_time % 60)
-            timer_label.config(text=f"Time: {minutes:02d}:{seconds:02d}")
-            root.after(1000, update_timer)
-        elif timer_running == False: 
-            stop_timer()
-
-    # Starting timer when game starts (after first click)
-    global start_timer
-    def start_timer():
-        global timer_running
-        timer_running = True
-        global start_time
-        start_time = time.time()
-        timer_label.config(text="Time: 00:00")
-        update_timer()
-
-    # Stopping timer and storing total time taken upon victory
-    global stop_timer
-    def stop_timer():
-        global elapsed_time, total_time
-        total_time = elapsed_time
-        root.after_cancel(update_timer)
-        return total_time
-    
-    # Create and place game board
-    create_board(rows, cols, mines, flags, game_frame, difficulty)
+    # How each board cell is drawn
+    def look(row, col):
+        value = endless_board.value(row, col)
+        if value is None:
+            return "", unclicked_cell_color, None
+        if value == "F":
+            return "F", unclicked_cell_color, flag_color
+        return value, clicked_cell_color, mine_text_colors[value]
+
+    # Left click function
+    def left_click(row, col):
+        endless_board.reveal(row, col)
+        if endless_board.lost:
+            game_over()
+            return
+        view.redraw()
+        cells_label.config(text=f"Cells: {endless_board.revealed_count}")
+
+    # Right click function
+    def right_click(row, col):
+        if endless_board.toggle_flag(row, col):
+            view.redraw()
+            flags_label.config(text=f"Flags: {endless_board.flag_count}")
+
+    # Drawing only the cells that fit in the window
+    view = renderer.ViewportCanvas(game_frame, 18, 26, default_font, look, bg_color, cell_highlight_color)
+    view.bind_click(1, left_click)
+    view.bind_click(3, right_click)
+    view.pack(expand=True)
+
+    # Scrolling with the arrow keys
+    view.canvas.bind("<Up>", lambda event: view.scroll(-1, 0))
+    view.canvas.bind("<Down>", lambda event: view.scroll(1, 0))
+    view.canvas.bind("<Left>", lambda event: view.scroll(0, -1))
+    view.canvas.bind("<Right>", lambda event: view.scroll(0, 1))
+
+    # Starting a new endless board, closing the last one
+    def refresh():
+        global endless_board
+        if endless_board is not None:
+            endless_board.close()
+        endless_board = infinite.InfiniteBoard(seed=random.randrange(2**32))
+        flags_label.config(text="Flags: 0")
+        view.center_on(0, 0)
+        view.canvas.focus_set()
+
+        # The cells around the middle never hold a mine, so the game starts by opening them
+        left_click(0, 0)
+
+    return screen, refresh
 
 # Function to pull up enter name screen
 def enter_name():
+    show_screen("enter name", build_enter_name)
+
+def build_enter_name():
     # Function to save the name provided
     def save_name(name):
         global player_name
         player_name = name
         choose_difficulty()
 
-    # Deleting previous widgets
-    for widget in root.winfo_children():
-        widget.destroy()
-    
     content_frame = tk.Frame(root, bg=bg_color)
-    content_frame.pack(expand=True, fill=tk.BOTH)
 
     content_frame.grid_rowconfigure(0, weight=1)
     content_frame.grid_rowconfigure(1, weight=1)
@@ -466,14 +629,14 @@ def enter_name():
     quit_button = tk.Button(content_frame, text="Quit", font=small_font, command=lambda: root.destroy(), bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
     quit_button.grid(row=2, column=0)
 
+    return content_frame, None
+
 # Next button (to difficulty screen)
 def choose_difficulty():
-    # Deleting previous widgets
-    for widget in root.winfo_children():
-        widget.destroy()
-    
+    show_screen("choose difficulty", build_choose_difficulty)
+
+def build_choose_difficulty():
     content_frame = tk.Frame(root, bg=bg_color)
-    content_frame.pack(expand=True, fill=tk.BOTH)
 
     content_frame.grid_rowconfigure(0, weight=1)
     content_frame.grid_rowconfigure(1, weight=1)
@@ -494,6 +657,10 @@ def choose_difficulty():
     quit_button = tk.Button(content_frame, text="Quit", font=small_font, command=lambda: root.destroy(), bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
     quit_button.grid(row=5, column=0, padx=20)
 
+    # Creating the resume button, which is only shown if a game was left unfinished
+    resume_button = tk.Button(content_frame, text="Resume", font=default_font, command=lambda: resume_game(), bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
+    resume_button.grid(row=1, column=1, sticky=tk.N, pady=10)
+
     # Creating the easy button
     easy_button = tk.Button(content_frame, text="Easy", font=default_font, command=lambda: game(easy_rows, easy_columns, easy_mines, easy_flags), bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
     easy_button.grid(row=2, column=1, sticky=tk.N, pady=10)
@@ -506,11 +673,34 @@ def choose_difficulty():
     hard_button = tk.Button(content_frame, text="Hard", font=default_font, command=lambda: game(hard_rows, hard_columns, hard_mines, hard_flags), bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
     hard_button.grid(row=4, column=1, sticky=tk.N, pady=10)
 
+    # Creating the endless button
+    endless_button = tk.Button(content_frame, text="Endless", font=default_font, command=lambda: endless_game(), bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
+    endless_button.grid(row=5, column=1, sticky=tk.N, pady=10)
+
+    # Showing or hiding the resume button
+    def refresh():
+        if os.path.exists(save_path) and os.path.exists(save_replay_path):
+            resume_button.grid()
+        else:
+            resume_button.grid_remove()
+
+    return content_frame, refresh
+
 # Start Button
 def start():
-    # Deleting previous widgets
-    for widget in content_frame.winfo_children():
-        widget.destroy()
+    show_screen("instructions", build_instructions)
+
+def build_instructions():
+    content_frame = tk.Frame(root, bg=bg_color)
+
+    content_frame.grid_rowconfigure(0, weight=1)
+    content_frame.grid_rowconfigure(1, weight=1)
+    content_frame.grid_rowconfigure(2, weight=1)
+    content_frame.grid_rowconfigure(3, weight=1)
+
+    content_frame.grid_columnconfigure(0, weight=1)
+    content_frame.grid_columnconfigure(1, weight=1)
+    content_frame.grid_columnconfigure(2, weight=1)
 
     # Creating instructions label
     instructions_label = tk.Label(content_frame, text="Instructions:", font=title_font, bg=bg_color, fg=text_color)
@@ -528,30 +718,101 @@ def start():
     next_button = tk.Button(content_frame, text="Next", font=small_font, command=lambda: enter_name(), bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
     next_button.grid(row=3, column=2)
 
-# Creating content frame
-content_frame = tk.Frame(root, bg=bg_color)
-content_frame.pack(expand=True, fill=tk.BOTH)
+    return content_frame, None
+
+# Title screen
+def title():
+    show_screen("title", build_title)
+
+def build_title():
+    # Creating content frame
+    content_frame = tk.Frame(root, bg=bg_color)
 
-content_frame.grid_rowconfigure(0, weight=1)
-content_frame.grid_rowconfigure(1, weight=1)
-content_frame.grid_rowconfigure(2, weight=1)
-content_frame.grid_rowconfigure(3, weight=1)
+    content_frame.grid_rowconfigure(0, weight=1)
+    content_frame.grid_rowconfigure(1, weight=1)
+    content_frame.grid_rowconfigure(2, weight=1)
+    content_frame.grid_rowconfigure(3, weight=1)
 
-content_frame.grid_columnconfigure(0, weight=1)
-content_frame.grid_columnconfigure(1, weight=1)
-content_frame.grid_columnconfigure(2, weight=1)
+    content_frame.grid_columnconfigure(0, weight=1)
+    content_frame.grid_columnconfigure(1, weight=1)
+    content_frame.grid_columnconfigure(2, weight=1)
 
-# Creating the title label
-title_label = tk.Label(content_frame, text="Minesweeper", font=title_font, fg=text_color, bg=bg_color)
-title_label.grid(row=0, column=1)
+    # Creating the title label
+    title_label = tk.Label(content_frame, text="Minesweeper", font=title_font, fg=text_color, bg=bg_color)
+    title_label.grid(row=0, column=1)
 
-# Creating the start button
-start_button = tk.Button(content_frame, text="Start", font=default_font, command=lambda: start(), bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
-start_button.grid(row=2, column=1)
+    # Creating the start button
+    start_button = tk.Button(content_frame, text="Start", font=default_font, command=lambda: start(), bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
+    start_button.grid(row=2, column=1)
 
-# Creating the quit button
-quit_button = tk.Button(content_frame, text="Quit", font=small_font, command=lambda: root.destroy(), bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
-quit_button.grid(row=3, column=0)
+    # Creating the quit button
+    quit_button = tk.Button(content_frame, text="Quit", font=small_font, command=lambda: root.destroy(), bg=button_bg_color, fg=text_color, highlightbackground=button_highlight_color)
+    quit_button.grid(row=3, column=0)
 
-# Start the GUI event loop
-root.mainloop()
\ No newline at end of file
+    return content_frame, None
+
+# Opens the window, fonts, leaderboard and board pool and shows the title screen
+# start_filler=False skips the board pool's background process, e.g. for benchmarks
+def setup(start_filler=True):
+    global root, title_font, difficulty_font, default_font, small_font, scores, boards
+
+    # Registering the bundled fonts before Tk starts, so Tk can find them
+    fonts.register_fonts()
+
+    # Creating main window
+    root = tk.Tk()
+    root.title("Minesweeper")
+    root.geometry("800x600")
+
+    # Looking the font up once for every size
+    family = fonts.pick_family(root, "Bungee")
+    title_font = tkfont.Font(root, family=family, size=30)
+    difficulty_font = tkfont.Font(root, family=family, size=24)
+    default_font = tkfont.Font(root, family=family, size=12)
+    small_font = tkfont.Font(root, family=family, size=10)
+
+    # Local leaderboard, which brings in the results from the old leaderboard.txt the first time it is opened
+    scores = leaderboard.Leaderboard("leaderboard.db", "leaderboard.txt")
+
+    # Boards that can be solved without guessing, made ahead of time by a background process
+    boards = board_pool.BoardPool("board_pool.db")
+    if start_filler:
+        boards.start_filler()
+
+    title()
+    return root
+
+# Closes everything setup() opened
+def shutdown():
+    boards.stop_filler()
+    if save is not None:
+        save.close()
+    if endless_board is not None:
+        endless_board.close()
+    scores.close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Minesweeper")
+    parser.add_argument("--profile", metavar="PATH", default=os.environ.get(instrument.env_var),
+                        help="time the game's hot paths and write a report to PATH when it closes "
+                             "(.json or .csv, or .prof for a cProfile)")
+    args = parser.parse_args(argv)
+    if args.profile:
+        instrument.install(args.profile)
+        # Timing every screen build and switch as well; show_screen looks the build functions up when it is called
+        this_module = sys.modules[__name__]
+        for name in dir(this_module):
+            if name.startswith("build_"):
+                instrument.wrap(this_module, name, f"screen.{name}")
+        instrument.wrap(this_module, "show_screen", "screen.show_screen")
+
+    setup()
+    # Start the GUI event loop
+    try:
+        root.mainloop()
+    finally:
+        shutdown()
+
+
+if __name__ == "__main__":
+    main()
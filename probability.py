@@ -0,0 +1,317 @@
+import math
+
+# Exact mine probabilities for every hidden cell, from what is on screen (revealed numbers and flags)
+# Used for the hint overlay
+#
+# The frontier (hidden cells next to a revealed number) is split into groups that share no number.
+# Each group is counted on its own, by mine count, and the counts are cached under the group's
+# constraints, so after a click only the groups it changed are counted again.
+# The groups are then combined with the number of mines left to spread over the other hidden cells.
+# Flags are taken to be mines.
+
+
+class MineProbabilities:
+    def __init__(self, board):
+        self.board = board
+        # Group constraints -> counts, for the groups on the board at the last compute()
+        self.cache = {}
+        # Hits and misses on the cache at the last compute()
+        self.hits = 0
+        self.misses = 0
+        # Chance of a mine for hidden cells that are not next to any number
+        self.interior = None
+        # Revealed numbers with hidden neighbors -> their constraint, kept up to date from what changed
+        self.constraints = {}
+        self.seen_revealed = bytearray(board.size)
+        self.seen_flagged = bytearray(board.size)
+        # Revealed numbers with no hidden neighbors left whose flags do not match them
+        self.contradictions = set()
+
+    # Re-reads only the numbers around cells that were revealed, flagged or unflagged since the last call
+    def update_constraints(self):
+        board = self.board
+        changed = changed_cells(self.seen_revealed, board.revealed) + changed_cells(self.seen_flagged, board.flagged)
+        self.seen_revealed[:] = board.revealed
+        self.seen_flagged[:] = board.flagged
+        touched = set()
+        for cell in changed:
+            touched.update(board.neighbors(*board.position(cell)))
+            touched.add(cell)
+        for i in touched:
+            constraint = None
+            if board.revealed[i] and board.counts[i]:
+                constraint = number_constraint(board, i)
+            if constraint and constraint[0]:
+                self.constraints[i] = constraint
+            else:
+                self.constraints.pop(i, None)
+            # A number with nothing hidden around it gives no constraint, but its flags still have to add up
+            if constraint and not constraint[0] and constraint[1] != 0:
+                self.contradictions.add(i)
+            else:
+                self.contradictions.discard(i)
+
+    # Returns {cell: chance of a mine} for every hidden, unflagged cell
+    # Returns an empty dictionary if the flags on screen cannot all be right
+    def compute(self):
+        board = self.board
+        hidden = [i for i in range(board.size) if not board.revealed[i] and not board.flagged[i]]
+        mines_left = board.mines - sum(board.flagged)
+        if board.lost:
+            return {}
+        if not board.placed:
+            self.interior = mines_left / len(hidden) if hidden else 0.0
+            return dict.fromkeys(hidden, self.interior)
+
+        self.update_constraints()
+        if self.contradictions:
+            self.interior = None
+            return {}
+        groups = group_constraints(list(self.constraints.values()))
+        cache = {}
+        tables = []
+        self.hits = self.misses = 0
+        for signature in groups:
+            table = self.cache.get(signature)
+            if table is None:
+                self.misses += 1
+                table = count_group(signature)
+            else:
+                self.hits += 1
+            cache[signature] = table
+            tables.append(table)
+        # Only the current groups are kept, so the cache never grows past the board's frontier
+        self.cache = cache
+
+        frontier_cells = sum(len(table[1]) for table in tables)
+        inside = len(hidden) - frontier_cells
+        chances = combine(tables, inside, mines_left)
+        if chances is None:
+            self.interior = None
+            return {}
+        group_chances, self.interior = chances
+        result = dict.fromkeys(hidden, self.interior)
+        result.update(group_chances)
+        return result
+
+
+# Byte translation table that turns anything but 0 into 1
+_NONZERO_TO_ONE = bytes([0] + [1] * 255)
+
+
+# Returns the cells whose byte differs between two layers
+def changed_cells(old, new):
+    difference = int.from_bytes(old, "big") ^ int.from_bytes(new, "big")
+    if not difference:
+        return []
+    marks = difference.to_bytes(len(new), "big").translate(_NONZERO_TO_ONE)
+    cells = []
+    i = marks.find(1)
+    while i != -1:
+        cells.append(i)
+        i = marks.find(1, i + 1)
+    return cells
+
+
+# Hidden, unflagged neighbors of a revealed number and how many mines are still missing around it
+def number_constraint(board, i):
+    cols = board.cols
+    row, col = divmod(i, cols)
+    unknown = []
+    flags = 0
+    for r in range(max(0, row-1), min(board.rows, row+2)):
+        for n in range(r * cols + max(0, col-1), r * cols + min(cols, col+2)):
+            if board.flagged[n]:
+                flags += 1
+            elif not board.revealed[n]:
+                unknown.append(n)
+    return tuple(unknown), board.counts[i] - flags
+
+
+# Splits (hidden cells, mines missing) constraints into groups that share no cell
+# Returns each group as a sorted tuple of its constraints, which is also the key it is cached under
+def group_constraints(constraints):
+    parent = {}
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for unknown, _ in constraints:
+        for n in unknown:
+            parent.setdefault(n, n)
+        root = find(unknown[0])
+        for n in unknown[1:]:
+            parent[find(n)] = root
+
+    groups = {}
+    for constraint in constraints:
+        groups.setdefault(find(constraint[0][0]), []).append(constraint)
+    return [tuple(sorted(group)) for group in groups.values()]
+
+
+# Adds list b into list a, shifted along by shift
+def _add_into(a, b, shift=0):
+    if len(a) < len(b) + shift:
+        a.extend([0] * (len(b) + shift - len(a)))
+    for k, ways in enumerate(b):
+        a[k + shift] += ways
+
+
+# Multiplies two counts-by-mines lists as polynomials
+def _convolve(a, b):
+    result = [0] * (len(a) + len(b) - 1)
+    for i, x in enumerate(a):
+        if x:
+            for j, y in enumerate(b):
+                result[i + j] += x * y
+    return result
+
+
+# Counts the mine layouts of one group, by number of mines
+# Returns (ways, cells) where ways[k] is the number of layouts with k mines
+# and cells[cell][k] is the number of those layouts that have a mine on cell
+#
+# Cells are decided one at a time along the group. A number only matters from its first cell to its last,
+# so the layouts so far are kept as the mines placed around the numbers still "open" at that point;
+# layouts that agree on those are merged. Going forwards and then backwards gives every cell's count.
+def count_group(constraints):
+    # Putting cells in order, walking from each cell to its numbers' other cells, so numbers stay open briefly
+    by_cell = {}
+    for j, (unknown, _) in enumerate(constraints):
+        for n in unknown:
+            by_cell.setdefault(n, []).append(j)
+    order = []
+    seen = set()
+    for start in sorted(by_cell):
+        if start in seen:
+            continue
+        seen.add(start)
+        order.append(start)
+        head = len(order) - 1
+        while head < len(order):
+            for j in by_cell[order[head]]:
+                for n in constraints[j][0]:
+                    if n not in seen:
+                        seen.add(n)
+                        order.append(n)
+            head += 1
+    cell_count = len(order)
+    position = {n: p for p, n in enumerate(order)}
+
+    needed = [missing for _, missing in constraints]
+    if any(missing < 0 or missing > len(unknown) for unknown, missing in constraints):
+        return [0], {n: [0] for n in order}
+
+    # For every number: its cells by position, and how many of its cells come after each one
+    touching = [[] for _ in range(cell_count)]
+    left_after = {}
+    first = []
+    last = []
+    for j, (unknown, _) in enumerate(constraints):
+        places = sorted(position[n] for n in unknown)
+        first.append(places[0])
+        last.append(places[-1])
+        for t, p in enumerate(places):
+            touching[p].append(j)
+            left_after[j, p] = len(places) - t - 1
+    # Numbers open at each boundary (after cells 0..b-1 are decided)
+    open_at = [[j for j in range(len(constraints)) if first[j] < b <= last[j]] for b in range(cell_count + 1)]
+
+    # Deciding cell b on top of a state, returning the next state or None if a number breaks
+    def step(b, state, value):
+        placed = dict(zip(open_at[b], state))
+        for j in touching[b]:
+            count = placed.get(j, 0) + value
+            if count > needed[j] or count + left_after[j, b] < needed[j]:
+                return None
+            placed[j] = count
+        return tuple(placed[j] for j in open_at[b + 1])
+
+    # Forwards: layouts of cells 0..b-1 by state, counted by mines
+    forward = [{(): [1]}]
+    moves = []
+    for b in range(cell_count):
+        states = {}
+        move = {}
+        for state, ways in forward[b].items():
+            for value in (0, 1):
+                following = step(b, state, value)
+                if following is None:
+                    continue
+                move[state, value] = following
+                _add_into(states.setdefault(following, []), ways, value)
+        forward.append(states)
+        moves.append(move)
+
+    # Backwards: layouts of cells b..end for each state, counted by mines
+    backward = [None] * cell_count + [{(): [1]}]
+    for b in range(cell_count - 1, -1, -1):
+        states = {}
+        for state in forward[b]:
+            ways = []
+            for value in (0, 1):
+                following = moves[b].get((state, value))
+                if following is not None:
+                    _add_into(ways, backward[b + 1][following], value)
+            states[state] = ways
+        backward[b] = states
+
+    total = backward[0].get((), [0])
+    cells = {}
+    for b, n in enumerate(order):
+        mine_ways = []
+        for state, ways in forward[b].items():
+            following = moves[b].get((state, 1))
+            if following is not None:
+                _add_into(mine_ways, _convolve(ways, backward[b + 1][following]), 1)
+        cells[n] = mine_ways
+    return total, cells
+
+
+# Combines the groups with the hidden cells away from the frontier
+# Every layout of the groups leaves mines_left - k mines for the inside cells, which can go comb(inside, ...) ways
+# Returns ({cell: chance}, chance for inside cells), or None if no layout fits
+def combine(tables, inside, mines_left):
+    def weight(k):
+        rest = mines_left - k
+        return math.comb(inside, rest) if 0 <= rest <= inside else 0
+
+    # Counts of every group but one, built from running products from the left and from the right
+    before = [[1]]
+    for ways, _ in tables:
+        before.append(_convolve(before[-1], ways))
+    after = [[1]]
+    for ways, _ in reversed(tables):
+        after.append(_convolve(after[-1], ways))
+    after.reverse()
+
+    everything = before[-1]
+    total = sum(ways * weight(k) for k, ways in enumerate(everything))
+    if total == 0:
+        return None
+
+    chances = {}
+    for g, (_, cells) in enumerate(tables):
+        others = _convolve(before[g], after[g + 1])
+        # Weight of this group holding k mines, summed over everything the other groups can hold
+        group_weight = {}
+        for cell, mine_ways in cells.items():
+            count = 0
+            for k, ways in enumerate(mine_ways):
+                if ways:
+                    if k not in group_weight:
+                        group_weight[k] = sum(o * weight(k + m) for m, o in enumerate(others))
+                    count += ways * group_weight[k]
+            chances[cell] = count / total
+
+    # Each inside cell holds a mine in comb(inside - 1, rest - 1) of the comb(inside, rest) ways
+    if inside:
+        inside_count = sum(ways * math.comb(inside - 1, mines_left - k - 1)
+                           for k, ways in enumerate(everything) if 1 <= mines_left - k <= inside)
+        inside_chance = inside_count / total
+    else:
+        inside_chance = 0.0
+    return chances, inside_chance
@@ -0,0 +1,246 @@
+import argparse
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import engine
+import leaderboard
+
+# Head-to-head races over TCP: every player in a race gets the same board and the first to clear it wins
+# Each player's moves are played on their own headless engine.Board on the server, so a client only ever
+# learns the cells it has really opened and cannot claim a win it did not play
+# Every race runs in the one event loop; the leaderboard is written from a separate thread so a slow disk
+# never holds up the moves
+#
+# One line of text per message, cells given as flat indexes (row * cols + col)
+#   client -> server   J <name>                  join the next race (first message)
+#                      R <cell>                  reveal a cell
+#                      F <cell>                  flag or unflag a cell
+#   server -> client   S <rows> <cols> <mines> <players> <player> <start cell>
+#                                                race started; you are <player>, and <start cell> is safe
+#                      O <cell>:<value> ...      cells your reveal opened; value is 0-8, or X for a mine
+#                      F <cell> <1|0>            flag placed / taken away
+#                      P <player> <cells revealed> <flags>
+#                                                another player's progress after one of their moves
+#                      D <player> <W|L|Q> <seconds>
+#                                                a player won, lost or quit
+#                      E <reason>                move refused
+#                      X                         race over, the server closes the connection
+# Usage: python race_server.py [--port 5515] [--players 2] [--difficulty Hard] [--leaderboard leaderboard.db]
+
+default_port = 5515
+
+
+class Player:
+    def __init__(self, name, writer):
+        self.name = name
+        self.writer = writer
+        self.number = None
+        self.board = None
+        self.finished = False
+
+    def send(self, line):
+        if not self.writer.is_closing():
+            self.writer.write(line.encode() + b"\n")
+
+    # Safe cells opened so far
+    @property
+    def revealed(self):
+        board = self.board
+        return board.size - board.mines - board.unrevealed_safe
+
+    @property
+    def flags(self):
+        return self.board.mines - self.board.flags_left
+
+
+class Race:
+    def __init__(self, server, seed):
+        self.server = server
+        self.seed = seed
+        self.players = []
+        self.started_at = None
+        self.finished = 0
+
+    @property
+    def full(self):
+        return len(self.players) == self.server.players_per_race
+
+    def add(self, player):
+        player.number = len(self.players)
+        self.players.append(player)
+        if self.full:
+            self.start()
+
+    def start(self):
+        server = self.server
+        rows, cols, mines = server.rows, server.cols, server.mines
+        start_row, start_col = rows // 2, cols // 2
+        # Same mines for everyone, with the 3x3 area around the start cell kept clear
+        cells = engine.Board(rows, cols, mines, seed=self.seed).sample_mines(start_row, start_col)
+        for player in self.players:
+            player.board = engine.Board(rows, cols, mines, seed=self.seed)
+            player.board.set_mines(cells)
+            player.send(f"S {rows} {cols} {mines} {len(self.players)} {player.number} {start_row * cols + start_col}")
+        self.started_at = time.monotonic()
+
+    def broadcast(self, line, skip=None):
+        for player in self.players:
+            if player is not skip:
+                player.send(line)
+
+    # Plays one move for player and sends the results; returns an error message if the move is refused
+    def move(self, player, action, cell):
+        if self.started_at is None:
+            return "race has not started"
+        if player.finished:
+            return "you have finished"
+        board = player.board
+        if not 0 <= cell < board.size:
+            return f"cell {cell} is not on the board"
+        row, col = board.position(cell)
+
+        if action == "R":
+            opened = board.left_click(row, col)
+            if not opened:
+                return "cannot open that cell"
+            player.send("O " + " ".join(f"{i}:{'X' if board.mine[i] else board.counts[i]}" for i in opened))
+        else:
+            changed = board.right_click(row, col)
+            if not changed:
+                return "cannot flag that cell"
+            player.send(f"F {cell} {board.flagged[cell]}")
+
+        self.broadcast(f"P {player.number} {player.revealed} {player.flags}", skip=player)
+        if board.won or board.lost:
+            self.finish(player, "W" if board.won else "L")
+        return None
+
+    def finish(self, player, result):
+        if player.finished:
+            return
+        player.finished = True
+        seconds = time.monotonic() - self.started_at if self.started_at is not None else 0.0
+        self.broadcast(f"D {player.number} {result} {seconds:.3f}")
+        if result == "W":
+            self.server.save_time(player.name, seconds)
+        self.finished += 1
+        # Once everyone is done the connections are closed, which ends every player's handle() loop
+        if self.finished == len(self.players):
+            self.broadcast("X")
+            for other in self.players:
+                other.writer.close()
+
+
+class RaceServer:
+    def __init__(self, players_per_race=2, difficulty="Hard", leaderboard_path="leaderboard.db", seed=None,
+                 batch_size=1):
+        if players_per_race < 1:
+            raise ValueError(f"a race needs at least 1 player, got {players_per_race}")
+        self.players_per_race = players_per_race
+        self.difficulty = difficulty
+        self.rows, self.cols, self.mines = engine.difficulties[difficulty]
+        self.rng = random.Random(seed)
+        self.waiting = None
+        self.races_started = 0
+
+        # SQLite connections belong to the thread that opened them, so the leaderboard is opened and only ever
+        # used on this one thread; writes queue up there in order
+        self.leaderboard_thread = ThreadPoolExecutor(max_workers=1)
+        self.scores = None
+        if leaderboard_path is not None:
+            self.scores = self.leaderboard_thread.submit(leaderboard.Leaderboard, leaderboard_path, None, batch_size).result()
+        self.server = None
+
+    async def start(self, host="127.0.0.1", port=default_port):
+        self.server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        return self.server
+
+    def save_time(self, name, seconds):
+        if self.scores is not None:
+            self.leaderboard_thread.submit(self.scores.save_time, self.difficulty, name, round(seconds, 3))
+
+    def join(self, player):
+        if self.waiting is None or self.waiting.full:
+            self.waiting = Race(self, self.rng.randrange(2**32))
+            self.races_started += 1
+        race = self.waiting
+        race.add(player)
+        return race
+
+    async def handle(self, reader, writer):
+        player = None
+        race = None
+        try:
+            line = await reader.readline()
+            parts = line.decode(errors="replace").split(maxsplit=1)
+            if len(parts) != 2 or parts[0] != "J":
+                writer.write(b"E first message must be J <name>\n")
+                return
+            player = Player(parts[1].strip()[:40], writer)
+            race = self.join(player)
+
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                parts = line.split()
+                if len(parts) != 2 or parts[0] not in (b"R", b"F") or not parts[1].isdigit():
+                    player.send("E expected R <cell> or F <cell>")
+                else:
+                    error = race.move(player, parts[0].decode(), int(parts[1]))
+                    if error is not None:
+                        player.send(f"E {error}")
+                # Waiting here if this client is slow to read what it is sent
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if race is not None:
+                if race.started_at is None:
+                    # Leaving a race that has not started frees the place for someone else
+                    race.players.remove(player)
+                    for number, other in enumerate(race.players):
+                        other.number = number
+                else:
+                    race.finish(player, "Q")
+            writer.close()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        if self.scores is not None:
+            self.leaderboard_thread.submit(self.scores.close).result()
+        self.leaderboard_thread.shutdown()
+
+
+async def serve(args):
+    server = RaceServer(args.players, args.difficulty, args.leaderboard, args.seed, args.batch_size)
+    await server.start(args.host, args.port)
+    print(f"Racing {args.difficulty} with {args.players} players per race on {args.host}:{args.port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Minesweeper races between clients over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=default_port)
+    parser.add_argument("--players", type=int, default=2, help="players in each race")
+    parser.add_argument("--difficulty", choices=list(engine.difficulties), default="Hard")
+    parser.add_argument("--leaderboard", default="leaderboard.db", help="leaderboard database for winning times")
+    parser.add_argument("--batch-size", type=int, default=1, help="winning times written per leaderboard commit")
+    parser.add_argument("--seed", type=int, help="seed for the races' boards, to run the same races again")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+import tkinter as tk
+
+# Draws the whole game board on a single Canvas instead of one Button per cell
+# Each cell is one rectangle item, plus a text item that is only created once the cell shows something
+# The font has to be a tkinter.font.Font or a font name
+
+
+class BoardCanvas:
+    def __init__(self, parent, rows, cols, font, cell_color, outline_color, bg, cell_size=30):
+        self.rows = rows
+        self.cols = cols
+        self.font = str(font)
+        self.width = cols * cell_size
+        self.height = rows * cell_size
+        self.cell_color = cell_color
+        self.canvas = tk.Canvas(parent, width=self.width, height=self.height, bg=bg, highlightthickness=0)
+
+        # Creating a rectangle for each cell, in the same row * cols + col order as the board engine
+        self.rects = []
+        for row in range(rows):
+            y = row * cell_size
+            for col in range(cols):
+                x = col * cell_size
+                self.rects.append(self.canvas.create_rectangle(x, y, x + cell_size, y + cell_size,
+                                                               fill=cell_color, outline=outline_color, tags="cell"))
+        # Cells that have a text item, tagged "t<cell>" and "text" on the canvas
+        self.texts = set()
+        # Cells waiting to be drawn and the id of the scheduled draw
+        self.pending = {}
+        self.flush_id = None
+        # What each cell currently shows, so drawing the same thing twice costs nothing
+        self.drawn = [("", cell_color, None)] * (rows * cols)
+
+        # Stretching the board when the window changes size
+        self.canvas.bind("<Configure>", self.resize)
+
+    # Places the canvas in its parent frame
+    def pack(self, **options):
+        self.canvas.pack(**options)
+
+    # Removes the canvas, dropping any draw that is still waiting
+    def destroy(self):
+        if self.flush_id is not None:
+            self.canvas.after_cancel(self.flush_id)
+            self.flush_id = None
+        self.canvas.destroy()
+
+    # Binds a function to a mouse button; the function gets the (row, col) of the clicked cell
+    def bind_click(self, button, function):
+        def on_click(event):
+            cell = self.cell_at(event.x, event.y)
+            if cell is not None:
+                function(*cell)
+        self.canvas.bind(f"<Button-{button}>", on_click)
+
+    # Works out which cell is under a point on the canvas
+    def cell_at(self, x, y):
+        row = int(y // self.cell_height)
+        col = int(x // self.cell_width)
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return row, col
+        return None
+
+    # Current size of a cell, which changes when the window is resized
+    @property
+    def cell_width(self):
+        return self.width / self.cols
+
+    @property
+    def cell_height(self):
+        return self.height / self.rows
+
+    # Queues a cell to be redrawn with the given text, background and text color
+    # Every queued cell is drawn together once Tk is idle, so a big reveal costs one update instead of one per cell
+    def draw_cell(self, i, text, fill, color=None):
+        self.pending[i] = (text, fill, color)
+        if self.flush_id is None:
+            self.flush_id = self.canvas.after_idle(self.flush)
+
+    # Draws every queued cell with a single Tcl script
+    def flush(self):
+        self.flush_id = None
+        pending, self.pending = self.pending, {}
+        if not self.canvas.winfo_exists():
+            return
+
+        path = str(self.canvas)
+        commands = []
+        for i, look in pending.items():
+            # Skipping cells that already look like this
+            if self.drawn[i] == look:
+                continue
+            text, fill, color = look
+            old_fill = self.drawn[i][1]
+            self.drawn[i] = look
+            color = color or ""
+
+            if fill != old_fill:
+                commands.append(f"{path} itemconfigure {self.rects[i]} -fill {{{fill}}}")
+            if i in self.texts:
+                commands.append(f"{path} itemconfigure t{i} -text {{{text}}} -fill {{{color}}}")
+            elif text != "":
+                row, col = divmod(i, self.cols)
+                x = (col + 0.5) * self.cell_width
+                y = (row + 0.5) * self.cell_height
+                commands.append(f"{path} create text {x} {y} -text {{{text}}} -fill {{{color}}} "
+                                f"-font {{{self.font}}} -tags {{t{i} text}}")
+                self.texts.add(i)
+        if commands:
+            self.canvas.tk.eval("\n".join(commands))
+
+    # Puts every cell back to hidden, so the canvas can be used again for a new game of the same size
+    def reset(self):
+        if self.flush_id is not None:
+            self.canvas.after_cancel(self.flush_id)
+            self.flush_id = None
+        self.pending = {}
+        self.canvas.delete("text", "hint")
+        self.canvas.itemconfigure("cell", fill=self.cell_color)
+        self.texts = set()
+        self.drawn = [("", self.cell_color, None)] * (self.rows * self.cols)
+
+    # Shows the chance of a mine, in percent, on each given cell, replacing any earlier hints
+    def show_hints(self, chances, font, color):
+        path = str(self.canvas)
+        commands = [f"{path} delete hint"]
+        for i, chance in chances.items():
+            row, col = divmod(i, self.cols)
+            x = (col + 0.5) * self.cell_width
+            y = (row + 0.5) * self.cell_height
+            commands.append(f"{path} create text {x} {y} -text {round(chance * 100)} -fill {{{color}}} "
+                            f"-font {{{font}}} -tags hint")
+        self.canvas.tk.eval("\n".join(commands))
+
+    def clear_hints(self):
+        self.canvas.delete("hint")
+
+    # Scales every item to the new canvas size in a single call
+    def resize(self, event):
+        if event.width <= 1 or event.height <= 1:
+            return
+        self.canvas.scale("all", 0, 0, event.width / self.width, event.height / self.height)
+        self.width = event.width
+        self.height = event.height
+
+
+# Draws a window onto a board with no edges, such as infinite.InfiniteBoard
+# Only the visible cells have canvas items, and they are reused as the view scrolls,
+# so the number of items stays the same however far the player goes
+class ViewportCanvas:
+    def __init__(self, parent, view_rows, view_cols, font, look, bg, outline_color, cell_size=30):
+        self.view_rows = view_rows
+        self.view_cols = view_cols
+        self.font = str(font)
+        # look(row, col) returns the (text, fill, text color) a board cell should be drawn with
+        self.look = look
+        self.cell_size = cell_size
+        # Board cell shown in the top left corner
+        self.origin_row = 0
+        self.origin_col = 0
+        self.canvas = tk.Canvas(parent, width=view_cols * cell_size, height=view_rows * cell_size, bg=bg, highlightthickness=0)
+
+        # A rectangle and a text item for each visible cell
+        self.rects = []
+        self.texts = []
+        for row in range(view_rows):
+            y = row * cell_size
+            for col in range(view_cols):
+                x = col * cell_size
+                self.rects.append(self.canvas.create_rectangle(x, y, x + cell_size, y + cell_size, outline=outline_color))
+                self.texts.append(self.canvas.create_text(x + cell_size / 2, y + cell_size / 2, text="", font=self.font))
+        # What each visible cell currently shows
+        self.drawn = [None] * (view_rows * view_cols)
+
+    def pack(self, **options):
+        self.canvas.pack(**options)
+
+    # Binds a function to a mouse button; the function gets the board (row, col) of the clicked cell
+    def bind_click(self, button, function):
+        def on_click(event):
+            row = int(event.y // self.cell_size)
+            col = int(event.x // self.cell_size)
+            if 0 <= row < self.view_rows and 0 <= col < self.view_cols:
+                function(self.origin_row + row, self.origin_col + col)
+        self.canvas.bind(f"<Button-{button}>", on_click)
+
+    # Moves the view so the given board cell is in the middle
+    def center_on(self, row, col):
+        self.origin_row = row - self.view_rows // 2
+        self.origin_col = col - self.view_cols // 2
+        self.redraw()
+
+    # Moves the view by a number of rows and columns
+    def scroll(self, rows, cols):
+        self.origin_row += rows
+        self.origin_col += cols
+        self.redraw()
+
+    # Redraws every visible cell that changed with a single Tcl script
+    def redraw(self):
+        path = str(self.canvas)
+        commands = []
+        k = 0
+        for row in range(self.origin_row, self.origin_row + self.view_rows):
+            for col in range(self.origin_col, self.origin_col + self.view_cols):
+                look = self.look(row, col)
+                if self.drawn[k] != look:
+                    text, fill, color = look
+                    self.drawn[k] = look
+                    commands.append(f"{path} itemconfigure {self.rects[k]} -fill {{{fill}}}")
+                    commands.append(f"{path} itemconfigure {self.texts[k]} -text {{{text}}} -fill {{{color or ''}}}")
+                k += 1
+        if commands:
+            self.canvas.tk.eval("\n".join(commands))
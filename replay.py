@@ -0,0 +1,321 @@
+import argparse
+import io
+import os
+import sys
+import time
+
+import board_pool
+import engine
+import leaderboard
+
+# Compact binary replays: every game is saved as its board plus the moves made, so it can be played again
+# without Tk to check that a leaderboard time is real
+#
+# File layout (every number is a varint: 7 bits per byte, low bits first, top bit set on all but the last byte)
+#   b"MSR" and a version byte
+#   rows, cols, mines, flags
+#   difficulty and player name, each as a length and UTF-8 bytes
+#   board kind: 0 then the seed (mines are placed by the first click), or 1 then the length and bytes of the mine bits
+#   events, each a tag = move * 3 + action (see move_code), then:
+#     reveal / flag: hundredths of a second since the previous event
+#     end: the time shown to the player, in milliseconds
+# Most moves are next to the last one and come within a second of it, so they take 2 bytes
+#
+# Usage: python replay.py replays/                                  check every replay in a folder
+#        python replay.py replays/ --leaderboard leaderboard.db     also check every leaderboard time has a replay
+
+magic = b"MSR\x01"
+actions = ("reveal", "flag", "end")
+# A win's time may end this many milliseconds after its last move (the click is handled before the timer stops)
+time_tolerance_ms = 250
+# Moves that stay within this many rows and columns of the last one get a short code
+near = 2
+near_codes = (2 * near + 1) ** 2
+
+
+def write_varint(out, value):
+    while value > 0x7f:
+        out.append(value & 0x7f | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def write_string(out, text):
+    data = text.encode()
+    write_varint(out, len(data))
+    out += data
+
+
+# Zigzag maps signed numbers to unsigned ones, keeping small numbers small: 0, -1, 1, -2 -> 0, 1, 2, 3
+def zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def unzigzag(value):
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+# Codes a move from the previous cell: a number below near_codes for a nearby cell, picked by row and column offset,
+# otherwise near_codes plus the zigzagged distance between the cells
+def move_code(previous, cell, cols):
+    row_step = cell // cols - previous // cols
+    col_step = cell % cols - previous % cols
+    if abs(row_step) <= near and abs(col_step) <= near:
+        return (row_step + near) * (2 * near + 1) + col_step + near
+    return near_codes + zigzag(cell - previous)
+
+
+def move_cell(previous, code, cols):
+    if code < near_codes:
+        row_step, col_step = divmod(code, 2 * near + 1)
+        return previous + (row_step - near) * cols + col_step - near
+    return previous + unzigzag(code - near_codes)
+
+
+# Records a game as it is played
+class Recorder:
+    def __init__(self, rows, cols, mines, flags, difficulty, name, seed=None, layout=None):
+        if (seed is None) == (layout is None):
+            raise ValueError("a replay needs either a seed or a mine layout")
+        self.data = bytearray(magic)
+        for value in (rows, cols, mines, flags):
+            write_varint(self.data, value)
+        write_string(self.data, difficulty)
+        write_string(self.data, name)
+        if layout is None:
+            self.data.append(0)
+            write_varint(self.data, seed)
+        else:
+            mines_data = board_pool.pack_mines(layout, rows * cols)
+            self.data.append(1)
+            write_varint(self.data, len(mines_data))
+            self.data += mines_data
+        self.difficulty = difficulty
+        self.cols = cols
+        self.last_cell = 0
+        self.last_cs = 0
+        self.finished = False
+        # Bytes already written by save_progress
+        self.written = 0
+
+    def _tag(self, cell, action):
+        write_varint(self.data, move_code(self.last_cell, cell, self.cols) * len(actions) + actions.index(action))
+        self.last_cell = cell
+
+    # Adds a move: action is "reveal" or "flag", seconds is the game timer at the time
+    def record(self, cell, action, seconds):
+        cs = max(self.last_cs, round(seconds * 100))
+        self._tag(cell, action)
+        write_varint(self.data, cs - self.last_cs)
+        self.last_cs = cs
+
+    # Ends the replay with the time shown to the player and returns its bytes
+    def finish(self, seconds):
+        if not self.finished:
+            self._tag(self.last_cell, "end")
+            write_varint(self.data, round(seconds * 1000))
+            self.finished = True
+        return bytes(self.data)
+
+    # Writes what has been recorded so far to path, adding only the new bytes, so the game can be resumed later
+    def save_progress(self, path):
+        with open(path, "ab" if self.written else "wb") as file:
+            file.write(self.data[self.written:])
+        self.written = len(self.data)
+
+    # Writes the finished replay to a new file in directory and returns its path
+    def save(self, directory, seconds):
+        data = self.finish(seconds)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.difficulty}-{time.time_ns()}.replay")
+        with open(path, "wb") as file:
+            file.write(data)
+        return path
+
+
+# Reads a replay from a binary stream a block at a time
+# The header is read straight away; iterating gives the moves as (time in hundredths of a second, cell, action)
+# and stops at the end record, after which claimed_ms holds the time shown to the player
+# With partial=True the replay may also stop after any move, as it does for a game still being played
+class ReplayReader:
+    def __init__(self, stream, block_size=4096, partial=False):
+        self.stream = stream
+        self.block_size = block_size
+        self.partial = partial
+        self.buffer = b""
+        self.position = 0
+        self.claimed_ms = None
+        if self.read(len(magic)) != magic:
+            raise ValueError("not a replay file, or a replay from a newer version")
+        self.rows, self.cols, self.mines, self.flags = (self.read_varint() for _ in range(4))
+        self.difficulty = self.read_string()
+        self.name = self.read_string()
+        kind = self.read(1)[0]
+        self.seed = None
+        self.layout = None
+        if kind == 0:
+            self.seed = self.read_varint()
+        elif kind == 1:
+            self.layout = board_pool.unpack_mines(self.read(self.read_varint()))
+        else:
+            raise ValueError(f"unknown board kind {kind}")
+
+    # Reads exactly count bytes, fetching more blocks from the stream as needed
+    def read(self, count):
+        while len(self.buffer) - self.position < count:
+            block = self.stream.read(self.block_size)
+            if not block:
+                raise ValueError("replay ends too early")
+            self.buffer = self.buffer[self.position:] + block
+            self.position = 0
+        data = self.buffer[self.position:self.position + count]
+        self.position += count
+        return data
+
+    def read_varint(self):
+        value = 0
+        shift = 0
+        while True:
+            byte = self.read(1)[0]
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def read_string(self):
+        return self.read(self.read_varint()).decode()
+
+    # True if the stream has nothing left to read
+    def at_end(self):
+        if self.position < len(self.buffer):
+            return False
+        block = self.stream.read(self.block_size)
+        if not block:
+            return True
+        self.buffer = block
+        self.position = 0
+        return False
+
+    def __iter__(self):
+        cell = 0
+        cs = 0
+        while True:
+            if self.partial and self.at_end():
+                return
+            code, action = divmod(self.read_varint(), len(actions))
+            cell = move_cell(cell, code, self.cols)
+            if actions[action] == "end":
+                self.claimed_ms = self.read_varint()
+                return
+            cs += self.read_varint()
+            yield cs, cell, actions[action]
+
+
+# Picks up recording a game saved part way through with save_progress
+def resume(path):
+    with open(path, "rb") as file:
+        data = file.read()
+    reader = ReplayReader(io.BytesIO(data), partial=True)
+    recorder = Recorder(reader.rows, reader.cols, reader.mines, reader.flags, reader.difficulty, reader.name,
+                        seed=reader.seed, layout=reader.layout)
+    for cs, cell, _ in reader:
+        recorder.last_cs = cs
+        recorder.last_cell = cell
+    if reader.claimed_ms is not None:
+        raise ValueError(f"{path} is a finished replay")
+    recorder.data = bytearray(data)
+    recorder.written = len(data)
+    return recorder
+
+
+# Plays a replay again on the board engine and checks every move was allowed and the time adds up
+# Returns a dictionary; "valid" is False with an "error" if anything does not
+def verify(path):
+    result = {"path": path, "valid": False, "won": False, "error": None}
+    try:
+        with open(path, "rb") as file:
+            reader = ReplayReader(file)
+            result.update(difficulty=reader.difficulty, name=reader.name)
+            board = engine.Board(reader.rows, reader.cols, reader.mines, reader.flags, seed=reader.seed)
+            if reader.layout is not None:
+                board.set_mines(reader.layout)
+            last_ms = 0
+            moves = 0
+            for cs, cell, action in reader:
+                if not 0 <= cell < board.size:
+                    raise ValueError(f"move {moves} is off the board")
+                if board.lost or board.won:
+                    raise ValueError(f"move {moves} comes after the end of the game")
+                row, col = board.position(cell)
+                # Only moves that changed something are recorded
+                if action == "reveal" and not board.left_click(row, col):
+                    raise ValueError(f"move {moves} reveals a cell that cannot be revealed")
+                if action == "flag" and not board.right_click(row, col):
+                    raise ValueError(f"move {moves} flags a cell that cannot be flagged")
+                last_ms = cs * 10
+                moves += 1
+            if not reader.at_end():
+                raise ValueError("data after the end of the replay")
+            # Move times are rounded to hundredths, so the time may be up to 5ms before the last move
+            if board.won and not last_ms - 5 <= reader.claimed_ms <= last_ms + time_tolerance_ms:
+                raise ValueError(f"time {reader.claimed_ms}ms does not match the moves, which end at {last_ms}ms")
+            result.update(valid=True, won=board.won, moves=moves, claimed_ms=reader.claimed_ms)
+    except (OSError, ValueError, IndexError, UnicodeDecodeError) as error:
+        result["error"] = str(error)
+    return result
+
+
+# Checks every .replay file in a directory on a pool of worker processes, yielding each result
+def check_directory(directory, workers=None):
+    # Imported here, so the game can record replays without loading multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    paths = [entry.path for entry in os.scandir(directory) if entry.name.endswith(".replay")]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from map(verify, paths)
+        return
+    # Sending files in big batches, since each one takes well under a millisecond
+    chunk_size = max(1, min(1000, len(paths) // (workers * 8)))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(verify, paths, chunksize=chunk_size)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check a folder of Minesweeper replays by playing them again")
+    parser.add_argument("directory", help="folder holding .replay files")
+    parser.add_argument("--workers", type=int, help="worker processes (default: every core)")
+    parser.add_argument("--leaderboard", help="leaderboard database whose times should each have a winning replay")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    checked = wins = 0
+    invalid = []
+    # (difficulty, name, time in ms) of every winning replay
+    proven = set()
+    for result in check_directory(args.directory, args.workers):
+        checked += 1
+        if not result["valid"]:
+            invalid.append(result)
+        elif result["won"]:
+            wins += 1
+            proven.add((result["difficulty"], result["name"], result["claimed_ms"]))
+    taken = time.perf_counter() - start
+
+    for result in invalid:
+        print(f"{result['path']}: {result['error']}")
+    print(f"{checked} replays in {taken:.2f}s ({checked / taken if taken else 0:.0f}/s): "
+          f"{checked - len(invalid)} valid ({wins} wins), {len(invalid)} invalid", file=sys.stderr)
+
+    if args.leaderboard:
+        scores = leaderboard.Leaderboard(args.leaderboard)
+        missing = [(difficulty, name, time_taken) for difficulty, name, time_taken in scores.all_times()
+                   if (difficulty, name, round(time_taken * 1000)) not in proven]
+        scores.close()
+        for difficulty, name, time_taken in missing:
+            print(f"no replay for {difficulty} {name} {time_taken:.3f}s")
+        print(f"{len(missing)} leaderboard times without a winning replay", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
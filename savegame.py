@@ -0,0 +1,153 @@
+import mmap
+import os
+import struct
+
+import engine
+
+# Save file for the game in progress, so quitting does not lose it
+# The file has a fixed layout, so a move only changes the bytes of the cells it touched:
+#   header: b"MSS" and a version byte, rows, cols, mines, flags left (4 bytes each),
+#           elapsed time in milliseconds (8 bytes), state bits (1 = mines placed, 2 = lost, 4 = won), 7 bytes padding,
+#           the board's seed (8 bytes, -1 for a board with no seed), so a game saved before its first click
+#           places the same mines as its replay once it is resumed
+#   mine bits, revealed bits and flag bits, one bit per cell each (cell i is bit i % 8 of byte i // 8)
+# The file is memory-mapped, so each move writes straight into the OS page cache with no read or rewrite of the file,
+# and opening a save only reads the header; the layers are unpacked when the board is actually needed
+
+magic = b"MSS\x02"
+header = struct.Struct("<4sIIIIqB7xq")
+no_seed = -1
+placed_bit = 1
+lost_bit = 2
+won_bit = 4
+
+
+def layer_size(size):
+    return (size + 7) // 8
+
+
+# Packs a layer of 0/1 bytes into bits
+# Each byte only holds 0 or 1, so shifting every 8th byte left by its place in the group puts it on its own bit
+def pack_layer(layer):
+    size = len(layer)
+    bits = 0
+    for k in range(8):
+        bits |= int.from_bytes(layer[k::8], "little") << k
+    return bits.to_bytes(layer_size(size), "little")
+
+
+# Unpacks bits back into a layer of size 0/1 bytes
+def unpack_layer(data, size):
+    count = len(data)
+    bits = int.from_bytes(data, "little")
+    ones = int.from_bytes(b"\x01" * count, "little")
+    layer = bytearray(count * 8)
+    for k in range(8):
+        layer[k::8] = ((bits >> k) & ones).to_bytes(count, "little")
+    del layer[size:]
+    return layer
+
+
+class SaveFile:
+    # Opens an existing save file, reading only its header
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "r+b")
+        self.map = mmap.mmap(self.file.fileno(), 0)
+        found, self.rows, self.cols, self.mines, self.flags_left, self.elapsed_ms, self.state, seed = \
+            header.unpack_from(self.map, 0)
+        self.seed = None if seed == no_seed else seed
+        if found != magic:
+            self.close()
+            raise ValueError(f"{path} is not a save file, or a save from a newer version")
+        self.size = self.rows * self.cols
+        self.layer_size = layer_size(self.size)
+        if len(self.map) != header.size + 3 * self.layer_size:
+            self.close()
+            raise ValueError(f"{path} is the wrong size for a {self.rows}x{self.cols} board")
+        # Where each layer starts
+        self.mine_at = header.size
+        self.revealed_at = self.mine_at + self.layer_size
+        self.flagged_at = self.revealed_at + self.layer_size
+
+    @property
+    def elapsed(self):
+        return self.elapsed_ms / 1000
+
+    # Rebuilds the saved board
+    def load(self):
+        board = engine.Board(self.rows, self.cols, self.mines, self.flags_left, seed=self.seed)
+        size = self.size
+        board.revealed[:] = unpack_layer(self.map[self.revealed_at:self.flagged_at], size)
+        board.flagged[:] = unpack_layer(self.map[self.flagged_at:self.flagged_at + self.layer_size], size)
+        if self.state & placed_bit:
+            board.mine[:] = unpack_layer(self.map[self.mine_at:self.revealed_at], size)
+            # Working out the numbers and the win counters from the mines
+            board.set_mines([])
+        else:
+            # With no mines yet every flag is a wrong one
+            board.wrong_flags = board.flagged.count(1)
+        board.lost = bool(self.state & lost_bit)
+        board.won = bool(self.state & won_bit)
+        return board
+
+    # Writes the header fields that change during a game
+    def write_header(self, board, seconds):
+        self.flags_left = board.flags_left
+        self.elapsed_ms = round(seconds * 1000)
+        self.state = placed_bit * board.placed | lost_bit * board.lost | won_bit * board.won
+        header.pack_into(self.map, 0, magic, self.rows, self.cols, self.mines, self.flags_left, self.elapsed_ms,
+                         self.state, no_seed if self.seed is None else self.seed)
+
+    # Writes the whole mine layer, once the first click has placed the mines
+    def write_mines(self, board, seconds):
+        self.map[self.mine_at:self.revealed_at] = pack_layer(board.mine)
+        self.write_header(board, seconds)
+
+    # Writes the cells a move changed, and the header
+    def update(self, board, cells, seconds):
+        data = self.map
+        for i in cells:
+            byte = i >> 3
+            bit = 1 << (i & 7)
+            for start, layer in ((self.revealed_at, board.revealed), (self.flagged_at, board.flagged)):
+                if layer[i]:
+                    data[start + byte] |= bit
+                else:
+                    data[start + byte] &= ~bit & 0xff
+        self.write_header(board, seconds)
+
+    # Writes changes to the disk now instead of when the OS gets to them
+    def flush(self):
+        self.map.flush()
+
+    def close(self):
+        if not self.map.closed:
+            self.map.close()
+        self.file.close()
+
+
+# Starts a save file for a board, replacing any old one
+def create(path, board, seconds=0.0):
+    with open(path, "wb") as file:
+        file.write(header.pack(magic, board.rows, board.cols, board.mines, board.flags_left, round(seconds * 1000),
+                               placed_bit * board.placed | lost_bit * board.lost | won_bit * board.won,
+                               no_seed if board.seed is None else board.seed))
+        for layer in (board.mine, board.revealed, board.flagged):
+            file.write(pack_layer(layer))
+    return SaveFile(path)
+
+
+# Opens the save file at path, or returns None if there is no usable one
+def open_save(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        return SaveFile(path)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def remove(path):
+    if os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,146 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import engine
+
+# Plays or generates lots of games without Tk, spread over every core, and streams one JSON line per game
+# Usage: python simulate.py --games 10000 --difficulty Hard > games.jsonl
+#        python simulate.py --games 1000 --rows 50 --cols 50 --mines 500 --mode generate
+
+
+# Plays a game with the simple rules: a number with that many hidden neighbors flags them all,
+# a number with that many flags around it opens the rest, and otherwise a random hidden cell is opened
+# Returns the number of clicks made
+def play(board, rng):
+    moves = 0
+    # Revealed numbers that may still have hidden neighbors
+    frontier = {i for i in range(board.size) if board.revealed[i] and not board.mine[i] and board.counts[i]}
+
+    def click(i):
+        nonlocal moves
+        moves += 1
+        for cell in board.left_click(*board.position(i)):
+            if not board.mine[cell] and board.counts[cell]:
+                frontier.add(cell)
+
+    while not board.lost and not board.won:
+        progress = False
+        for i in list(frontier):
+            hidden = []
+            flags = 0
+            for n in board.neighbors(*board.position(i)):
+                if board.flagged[n]:
+                    flags += 1
+                elif not board.revealed[n]:
+                    hidden.append(n)
+            if not hidden:
+                frontier.discard(i)
+            elif board.counts[i] == flags:
+                for n in hidden:
+                    click(n)
+                progress = True
+            elif board.counts[i] == flags + len(hidden):
+                for n in hidden:
+                    moves += 1
+                    board.right_click(*board.position(n))
+                progress = True
+            if board.lost or board.won:
+                break
+
+        # Guessing when the rules give nothing
+        if not progress and not board.lost and not board.won:
+            choices = [i for i in range(board.size) if not board.revealed[i] and not board.flagged[i]]
+            click(rng.choice(choices))
+    return moves
+
+
+# Runs one game and returns its result as a dictionary
+def run_game(game, seed, rows, cols, mines, mode):
+    rng = random.Random(seed)
+    board = engine.Board(rows, cols, mines, seed=seed)
+    row, col = rng.randrange(rows), rng.randrange(cols)
+    opening = len(board.left_click(row, col))
+    result = {"game": game, "seed": seed, "rows": rows, "cols": cols, "mines": mines,
+              "first_click": [row, col], "opening": opening}
+    if mode == "play":
+        moves = 1 + play(board, rng)
+        result.update(won=board.won, moves=moves, revealed=board.size - board.mines - board.unrevealed_safe)
+    return result
+
+
+# Runs a block of games in one worker process; every game gets its own seed so results do not depend on the worker
+def run_games(first_game, count, seed, rows, cols, mines, mode):
+    return [run_game(game, seed + game, rows, cols, mines, mode) for game in range(first_game, first_game + count)]
+
+
+# Yields every game result in order, running blocks of games on a pool of worker processes
+def simulate(games, rows, cols, mines, mode="play", seed=0, workers=None, block_size=None):
+    workers = workers or os.cpu_count() or 1
+    # Enough blocks to keep every worker busy, but big enough that sending results back stays cheap
+    block_size = block_size or max(1, min(1000, games // (workers * 8)))
+    blocks = [(first, min(block_size, games - first)) for first in range(0, games, block_size)]
+    if workers == 1:
+        for first, count in blocks:
+            yield from run_games(first, count, seed, rows, cols, mines, mode)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_games, first, count, seed, rows, cols, mines, mode) for first, count in blocks]
+        for future in futures:
+            yield from future.result()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Play or generate Minesweeper games in bulk and print them as JSON Lines")
+    parser.add_argument("--games", type=int, default=1000, help="number of games")
+    parser.add_argument("--difficulty", choices=sorted(engine.difficulties), default="Easy", help="board preset")
+    parser.add_argument("--rows", type=int, help="custom number of rows (needs --cols and --mines)")
+    parser.add_argument("--cols", type=int, help="custom number of columns")
+    parser.add_argument("--mines", type=int, help="custom number of mines")
+    parser.add_argument("--mode", choices=["play", "generate"], default="play",
+                        help="play each game out, or only make the first click")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game; game n uses seed + n")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: every core)")
+    parser.add_argument("--output", help="file to write to instead of standard output")
+    args = parser.parse_args(argv)
+
+    if args.games < 1:
+        parser.error(f"--games must be at least 1, got {args.games}")
+    if args.workers < 1:
+        parser.error(f"--workers must be at least 1, got {args.workers}")
+    if args.rows is not None or args.cols is not None or args.mines is not None:
+        if None in (args.rows, args.cols, args.mines):
+            parser.error("--rows, --cols and --mines have to be given together")
+        rows, cols, mines = args.rows, args.cols, args.mines
+    else:
+        rows, cols, mines = engine.difficulties[args.difficulty]
+    try:
+        engine.Board(rows, cols, mines)
+    except ValueError as error:
+        parser.error(str(error))
+
+    output = open(args.output, "w") if args.output else sys.stdout
+    start = time.perf_counter()
+    wins = 0
+    try:
+        for result in simulate(args.games, rows, cols, mines, args.mode, args.seed, args.workers):
+            output.write(json.dumps(result) + "\n")
+            wins += result.get("won", False)
+    finally:
+        if args.output:
+            output.close()
+    taken = time.perf_counter() - start
+
+    # Summary goes to standard error so it does not mix with the results
+    summary = f"{args.games} games in {taken:.2f}s ({args.games / taken:.0f} games/s, {args.workers} workers)"
+    if args.mode == "play":
+        summary += f", win rate {wins / args.games:.1%}"
+    print(summary, file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
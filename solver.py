@@ -0,0 +1,324 @@
+import random
+import time
+
+import engine
+
+# Automatic solver that plays an engine.Board using only what a player can see:
+# revealed numbers and its own flags. It never looks at where the mines are.
+# Each round tries, in order:
+#   1. trivial rules on single numbers (all mines found -> open the rest, only mines left -> flag them)
+#   2. subset rules between pairs of numbers whose hidden cells overlap
+#   3. exact enumeration of every small independent group of frontier cells
+#   4. a guess, at the cell least likely to be a mine
+# Numbers whose surroundings changed are kept in a "dirty" set, so each move only re-checks what it touched
+
+phases = ("trivial", "subset", "enumerate", "guess")
+
+
+class Solver:
+    def __init__(self, board, seed=None, max_component=24, guess=True):
+        self.board = board
+        self.rng = random.Random(seed)
+        # With guess=False the solver stops (stuck = True) instead of guessing
+        self.allow_guess = guess
+        self.stuck = False
+        # Groups of frontier cells larger than this are not enumerated (they fall through to a guess)
+        self.max_component = max_component
+        # Revealed numbers that still have hidden, unflagged neighbors
+        self.frontier = set()
+        # Numbers to re-check with the trivial rules, and with the subset rules
+        self.dirty = set()
+        self.subset_dirty = set()
+        # Time spent (ns), times run and cells decided, per phase
+        self.timings = dict.fromkeys(phases, 0)
+        self.runs = dict.fromkeys(phases, 0)
+        self.decided = dict.fromkeys(phases, 0)
+        # Mine chance for each frontier cell from the last enumeration, used to pick a guess
+        self.chances = {}
+
+    # Hidden, unflagged neighbors of a revealed number and how many mines are still missing around it
+    def constraint(self, i):
+        board = self.board
+        unknown = []
+        flags = 0
+        for n in board.neighbors(*board.position(i)):
+            if board.flagged[n]:
+                flags += 1
+            elif not board.revealed[n]:
+                unknown.append(n)
+        return unknown, board.counts[i] - flags
+
+    # Marks every revealed number around the given cells as needing a re-check
+    def touch(self, cells):
+        board = self.board
+        for cell in cells:
+            for n in board.neighbors(*board.position(cell)):
+                if board.revealed[n] and board.counts[n]:
+                    self.dirty.add(n)
+                    self.subset_dirty.add(n)
+                    self.frontier.add(n)
+
+    # Opens a cell and records what changed
+    def open(self, i):
+        board = self.board
+        opened = board.left_click(*board.position(i))
+        for cell in opened:
+            if board.counts[cell] and not board.lost:
+                self.dirty.add(cell)
+                self.subset_dirty.add(cell)
+                self.frontier.add(cell)
+        self.touch(opened)
+        return len(opened)
+
+    # Flags a cell that is known to be a mine and records what changed
+    def flag(self, i):
+        board = self.board
+        if board.flagged[i]:
+            return 0
+        board.right_click(*board.position(i))
+        self.touch([i])
+        return 1
+
+    def finished(self):
+        return self.board.lost or self.board.won
+
+    # Phase 1: single numbers
+    def trivial(self):
+        board = self.board
+        decided = 0
+        while self.dirty and not self.finished():
+            i = self.dirty.pop()
+            unknown, missing = self.constraint(i)
+            if not unknown:
+                self.frontier.discard(i)
+            elif missing == 0:
+                for n in unknown:
+                    if not board.revealed[n]:
+                        decided += 1
+                        self.open(n)
+            elif missing == len(unknown):
+                for n in unknown:
+                    decided += self.flag(n)
+        return decided
+
+    # Phase 2: pairs of numbers where one's hidden cells are all inside the other's
+    def subset(self):
+        board = self.board
+        constraints = {}
+
+        def get(i):
+            if i not in constraints:
+                unknown, missing = self.constraint(i)
+                constraints[i] = (frozenset(unknown), missing)
+            return constraints[i]
+
+        # Numbers left in subset_dirty after a deduction are checked next time
+        while self.subset_dirty and not self.finished():
+            a = self.subset_dirty.pop()
+            unknown_a, missing_a = get(a)
+            if not unknown_a:
+                continue
+            # Only numbers within two cells can share hidden cells with this one
+            row, col = board.position(a)
+            for r in range(max(0, row-2), min(board.rows, row+3)):
+                for c in range(max(0, col-2), min(board.cols, col+3)):
+                    b = r * board.cols + c
+                    if b == a or b not in self.frontier:
+                        continue
+                    unknown_b, missing_b = get(b)
+                    # Checking both directions, since only a is known to have changed
+                    for small, small_missing, big, big_missing in ((unknown_a, missing_a, unknown_b, missing_b),
+                                                                    (unknown_b, missing_b, unknown_a, missing_a)):
+                        if not small or not small < big:
+                            continue
+                        rest = big - small
+                        rest_missing = big_missing - small_missing
+                        # Keeping a in the queue, since it may pair up with other numbers too
+                        if rest_missing == 0:
+                            self.subset_dirty.add(a)
+                            for n in rest:
+                                if not board.revealed[n]:
+                                    self.open(n)
+                            return len(rest)
+                        if rest_missing == len(rest):
+                            self.subset_dirty.add(a)
+                            decided = 0
+                            for n in rest:
+                                decided += self.flag(n)
+                            return decided
+        return 0
+
+    # Splits the frontier into groups of hidden cells that share no number, with the numbers that constrain each group
+    def components(self):
+        constraints = {}
+        cell_constraints = {}
+        for i in list(self.frontier):
+            unknown, missing = self.constraint(i)
+            if not unknown:
+                self.frontier.discard(i)
+                continue
+            constraints[i] = (unknown, missing)
+            for n in unknown:
+                cell_constraints.setdefault(n, []).append(i)
+
+        seen = set()
+        groups = []
+        for start in cell_constraints:
+            if start in seen:
+                continue
+            # Walking from cell to number to cell, in order, so neighbouring cells are enumerated close together
+            cells = [start]
+            seen.add(start)
+            numbers = []
+            numbers_seen = set()
+            head = 0
+            while head < len(cells):
+                for i in cell_constraints[cells[head]]:
+                    if i not in numbers_seen:
+                        numbers_seen.add(i)
+                        numbers.append(i)
+                        for n in constraints[i][0]:
+                            if n not in seen:
+                                seen.add(n)
+                                cells.append(n)
+                head += 1
+            groups.append((cells, [constraints[i] for i in numbers]))
+        return groups
+
+    # Phase 3: enumerates every mine layout of each small group and applies the cells that are the same in all of them
+    def enumerate(self):
+        board = self.board
+        self.chances = {}
+        safe = []
+        mines = []
+        for cells, constraints in self.components():
+            if len(cells) > self.max_component:
+                continue
+            solutions, mine_counts = count_solutions(cells, constraints)
+            if solutions == 0:
+                continue
+            for n, count in zip(cells, mine_counts):
+                self.chances[n] = count / solutions
+                if count == 0:
+                    safe.append(n)
+                elif count == solutions:
+                    mines.append(n)
+
+        decided = 0
+        for n in mines:
+            decided += self.flag(n)
+        for n in safe:
+            if not board.revealed[n] and not self.finished():
+                decided += 1
+                self.open(n)
+        return decided
+
+    # Phase 4: opens the hidden cell least likely to be a mine
+    def guess(self):
+        board = self.board
+        hidden = [i for i in range(board.size) if not board.revealed[i] and not board.flagged[i]]
+        # Cells away from the frontier share the mines the frontier does not account for
+        frontier_mines = sum(self.chances.values())
+        inside = len(hidden) - len(self.chances)
+        left = board.mines - sum(board.flagged) - frontier_mines
+        inside_chance = left / inside if inside > 0 else 1.0
+
+        best = min(min(self.chances.values(), default=1.0), inside_chance)
+        choices = [i for i in hidden if self.chances.get(i, inside_chance) <= best]
+        self.open(self.rng.choice(choices or hidden))
+        return 1
+
+    # Runs a phase and adds its time and result to the counters
+    def run(self, phase):
+        start = time.perf_counter_ns()
+        decided = getattr(self, phase)()
+        self.timings[phase] += time.perf_counter_ns() - start
+        self.runs[phase] += 1
+        self.decided[phase] += decided
+        return decided
+
+    # Makes progress with the cheapest phase that finds something
+    def step(self):
+        if self.run("trivial") or self.finished():
+            return
+        if self.run("subset") or self.finished():
+            return
+        if self.run("enumerate") or self.finished():
+            return
+        if not self.allow_guess:
+            self.stuck = True
+            return
+        self.run("guess")
+
+    # Plays the board from the first click until it is won or lost; returns True on a win
+    def solve(self, first_row=None, first_col=None):
+        board = self.board
+        # Making the first click unless some cells are already open
+        if not board.placed or board.unrevealed_safe == board.size - board.mines:
+            first_row = board.rows // 2 if first_row is None else first_row
+            first_col = board.cols // 2 if first_col is None else first_col
+            start = time.perf_counter_ns()
+            self.open(board.index(first_row, first_col))
+            self.timings["guess"] += time.perf_counter_ns() - start
+        else:
+            self.frontier = {i for i in range(board.size) if board.revealed[i] and board.counts[i]}
+            self.dirty = set(self.frontier)
+            self.subset_dirty = set(self.frontier)
+        while not self.finished() and not self.stuck:
+            self.step()
+        return board.won
+
+    # Per-phase counters as a dictionary, with times in milliseconds
+    def stats(self):
+        return {phase: {"ms": self.timings[phase] / 1e6, "runs": self.runs[phase], "decided": self.decided[phase]}
+                for phase in phases}
+
+
+# Counts the mine layouts of a group of cells that satisfy every number around it,
+# and in how many of them each cell is a mine
+# constraints is a list of (hidden cells, mines missing) pairs
+def count_solutions(cells, constraints):
+    position = {n: k for k, n in enumerate(cells)}
+    needed = [missing for _, missing in constraints]
+    # Per number: mines placed so far and cells not yet decided
+    placed = [0] * len(constraints)
+    open_cells = [len(unknown) for unknown, _ in constraints]
+    by_cell = [[] for _ in cells]
+    for k, (unknown, _) in enumerate(constraints):
+        for n in unknown:
+            by_cell[position[n]].append(k)
+
+    values = [0] * len(cells)
+    mine_counts = [0] * len(cells)
+    solutions = 0
+
+    def assign(v):
+        nonlocal solutions
+        if v == len(cells):
+            solutions += 1
+            for k, value in enumerate(values):
+                mine_counts[k] += value
+            return
+        for value in (0, 1):
+            # Every number must still be able to reach exactly its count
+            if all(placed[k] + value <= needed[k] <= placed[k] + value + open_cells[k] - 1 for k in by_cell[v]):
+                for k in by_cell[v]:
+                    placed[k] += value
+                    open_cells[k] -= 1
+                values[v] = value
+                assign(v + 1)
+                for k in by_cell[v]:
+                    placed[k] -= value
+                    open_cells[k] += 1
+        values[v] = 0
+
+    assign(0)
+    return solutions, mine_counts
+
+
+# Solves a fresh board of the given size and returns (won, stats)
+def solve_board(rows, cols, mines, seed=None):
+    board = engine.Board(rows, cols, mines, seed=seed)
+    solver = Solver(board, seed=seed)
+    won = solver.solve()
+    return won, solver.stats()
@@ -0,0 +1,157 @@
+# Checks that the game over explosion keeps a fixed set of canvas items and drops frames instead of running late,
+# using a stand-in for a Tk canvas and a clock the test moves by hand
+# Usage: python -m pytest tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import animation
+
+
+# Keeps the items an animation makes and the callbacks it schedules, like a Tk canvas does
+class FakeCanvas:
+    def __init__(self):
+        self.items = {}
+        self.next_item = 0
+        self.scheduled = {}
+        self.next_id = 0
+        self.raised = []
+
+    def create(self, kind, coords, options):
+        self.next_item += 1
+        self.items[self.next_item] = {"kind": kind, "coords": list(coords), **options}
+        return self.next_item
+
+    def create_oval(self, *coords, **options):
+        return self.create("oval", coords, options)
+
+    def create_polygon(self, *coords, **options):
+        return self.create("polygon", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self.create("text", coords, options)
+
+    def coords(self, item, *coords):
+        self.items[item]["coords"] = list(coords)
+
+    def itemconfigure(self, item, **options):
+        self.items[item].update(options)
+
+    def tag_raise(self, item):
+        self.raised.append(item)
+
+    def find_all(self):
+        return tuple(self.items)
+
+    def after(self, ms, function):
+        self.next_id += 1
+        after_id = f"after#{self.next_id}"
+        self.scheduled[after_id] = (ms, function)
+        return after_id
+
+    def after_idle(self, function):
+        return self.after(0, function)
+
+    def after_cancel(self, after_id):
+        del self.scheduled[after_id]
+
+    # Runs the one callback that is waiting, moving clock on to when it is due plus lag_ms first
+    def run_next(self, clock, lag_ms=0):
+        assert len(self.scheduled) == 1
+        after_id, (ms, function) = self.scheduled.popitem()
+        clock.now += (ms + lag_ms) * 1_000_000
+        function()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def make_explosion():
+    canvas = FakeCanvas()
+    clock = FakeClock()
+    explosion = animation.Explosion(canvas, 400, 300, "TkDefaultFont")
+    explosion.scheduler.clock = clock
+    return canvas, clock, explosion
+
+
+# Runs the animation to the end, each callback running as soon as it is due plus lag_ms
+# Returns the frames drawn, in order
+def run(canvas, clock, explosion, lag_ms=0):
+    frames = []
+    draw = explosion.draw
+
+    def record(frame):
+        frames.append(frame)
+        draw(frame)
+    explosion.scheduler.on_frame = record
+    explosion.start()
+    while canvas.scheduled:
+        canvas.run_next(clock, lag_ms)
+        assert explosion.item_count == 17
+    return frames
+
+
+def test_items_stay_the_same_every_frame():
+    canvas, clock, explosion = make_explosion()
+    assert explosion.item_count == 17
+    assert all(item["state"] == "hidden" for item in canvas.items.values())
+
+    frames = run(canvas, clock, explosion)
+    scheduler = explosion.scheduler
+    assert frames == list(range(40))
+    assert scheduler.stats()["drawn"] == 40
+    assert scheduler.stats()["dropped"] == 0
+    assert explosion.item_count == 17
+    assert all(item["state"] == "normal" for item in canvas.items.values())
+    assert canvas.raised == [explosion.text_item]
+    # The rings end at the last frame's radius, 10 + 39 * 20
+    assert canvas.items[explosion.ring_items[0]]["coords"] == [400 - 790, 300 - 790, 400 + 790, 300 + 790]
+
+
+def test_frames_are_dropped_after_a_stall():
+    canvas, clock, explosion = make_explosion()
+    frames = []
+    draw = explosion.draw
+
+    def record(frame):
+        frames.append(frame)
+        draw(frame)
+    explosion.scheduler.on_frame = record
+    explosion.start()
+    canvas.run_next(clock)
+    canvas.run_next(clock)
+    assert frames == [0, 1]
+    # The event loop is held up for 10 frames' worth of time before the next callback runs
+    canvas.run_next(clock, lag_ms=200)
+    while canvas.scheduled:
+        canvas.run_next(clock)
+        assert explosion.item_count == 17
+
+    scheduler = explosion.scheduler
+    assert frames[:3] == [0, 1, 12]
+    assert frames[-1] == 39
+    assert frames == sorted(set(frames))
+    assert scheduler.stats()["dropped"] == 10
+    assert scheduler.stats()["drawn"] + scheduler.stats()["dropped"] == 40
+    assert all(item["state"] == "normal" for item in canvas.items.values())
+
+
+def test_slow_event_loop_still_ends_on_the_last_frame():
+    canvas, clock, explosion = make_explosion()
+    # Every callback runs 50ms late, so most frames are overdue by the time they could be drawn
+    frames = run(canvas, clock, explosion, lag_ms=50)
+    scheduler = explosion.scheduler
+    # Even the first callback runs 50ms late, so frame 0 is dropped and the first frame drawn shows everything
+    assert frames[0] == 2
+    assert all(item["state"] == "normal" for item in canvas.items.values())
+    assert frames[-1] == 39
+    assert frames == sorted(set(frames))
+    assert scheduler.stats()["dropped"] > 0
+    assert scheduler.stats()["drawn"] + scheduler.stats()["dropped"] == 40
+    assert scheduler.running is False
@@ -0,0 +1,107 @@
+# Property tests for the engine's running win counters: random boards and random moves,
+# checked after every move against a brute-force scan of the whole board
+# Usage: python -m pytest tests
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+
+
+# What the counters should be, worked out by looking at every cell
+def brute_force(board):
+    correct_flags = sum(1 for i in range(board.size) if board.flagged[i] and board.mine[i])
+    wrong_flags = sum(1 for i in range(board.size) if board.flagged[i] and not board.mine[i])
+    unrevealed_safe = sum(1 for i in range(board.size) if not board.mine[i] and not board.revealed[i])
+    if not board.placed:
+        # Before the first click no cell holds a mine yet, but the mines still to come are not safe cells
+        unrevealed_safe -= board.mines
+    won = board.placed and not board.lost and (
+        unrevealed_safe == 0 or (correct_flags == board.mines and wrong_flags == 0))
+    return correct_flags, wrong_flags, unrevealed_safe, won
+
+
+# The cells a reveal should open: a flood fill from (row, col) through 0 cells, stopping at flags
+def brute_force_reveal(board, row, col):
+    start = board.index(row, col)
+    if board.revealed[start] or board.flagged[start]:
+        return set()
+    opened = set()
+    stack = [start]
+    while stack:
+        i = stack.pop()
+        if i in opened or board.revealed[i] or board.flagged[i]:
+            continue
+        opened.add(i)
+        if not board.mine[i] and board.counts[i] == 0:
+            stack.extend(board.neighbors(*board.position(i)))
+    return opened
+
+
+def check_counters(board):
+    correct_flags, wrong_flags, unrevealed_safe, won = brute_force(board)
+    assert board.correct_flags == correct_flags
+    assert board.wrong_flags == wrong_flags
+    assert board.unrevealed_safe == unrevealed_safe
+    assert board.check_win() == won
+
+
+def play_random_game(rng):
+    rows, cols = rng.randint(1, 12), rng.randint(1, 12)
+    free_cells = rows * cols - min(rows, 3) * min(cols, 3)
+    board = engine.Board(rows, cols, rng.randint(0, free_cells), seed=rng.getrandbits(32))
+
+    # Flags placed before the first click have to be counted once the mines go down
+    for _ in range(rng.randint(0, 3)):
+        board.right_click(rng.randrange(rows), rng.randrange(cols))
+        check_counters(board)
+
+    while not board.lost and not board.won:
+        row, col = rng.randrange(rows), rng.randrange(cols)
+        if rng.random() < 0.3:
+            board.right_click(row, col)
+        else:
+            if not board.placed:
+                board.place_mines(row, col)
+            expected = brute_force_reveal(board, row, col)
+            opened = board.left_click(row, col)
+            assert sorted(opened) == sorted(expected)
+            assert len(opened) == len(set(opened))
+        check_counters(board)
+
+
+def test_counters_match_brute_force():
+    rng = random.Random(7)
+    for _ in range(3000):
+        play_random_game(rng)
+
+
+def test_revealing_every_safe_cell_wins():
+    rng = random.Random(70)
+    for _ in range(200):
+        board = engine.Board(9, 9, 10, seed=rng.getrandbits(32))
+        board.left_click(4, 4)
+        for i in range(board.size):
+            if not board.mine[i]:
+                assert board.won == (board.unrevealed_safe == 0)
+                board.left_click(*board.position(i))
+        assert board.won and not board.lost
+
+
+def test_flagging_every_mine_wins():
+    rng = random.Random(700)
+    for _ in range(200):
+        board = engine.Board(9, 9, 10, seed=rng.getrandbits(32))
+        board.left_click(4, 4)
+        mines = [i for i in range(board.size) if board.mine[i]]
+        # A wrong flag holds the win back until it is taken away
+        wrong = next(i for i in range(board.size) if not board.mine[i] and not board.revealed[i])
+        board.right_click(*board.position(wrong))
+        for i in mines[:-1]:
+            board.right_click(*board.position(i))
+        assert not board.check_win()
+        board.right_click(*board.position(wrong))
+        board.right_click(*board.position(mines[-1]))
+        assert board.check_win()
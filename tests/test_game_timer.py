@@ -0,0 +1,77 @@
+# Checks that the game timer never leaves a scheduled refresh behind, using a stand-in for a Tk widget
+# Usage: python -m pytest tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import game_timer
+
+
+# Keeps the callbacks scheduled with after() like Tk does, and runs them when told to
+class FakeWidget:
+    def __init__(self):
+        self.scheduled = {}
+        self.next_id = 0
+
+    def after(self, ms, function):
+        self.next_id += 1
+        after_id = f"after#{self.next_id}"
+        self.scheduled[after_id] = function
+        return after_id
+
+    def after_cancel(self, after_id):
+        del self.scheduled[after_id]
+
+    # Runs everything scheduled right now, as the event loop would once it is due
+    def run_due(self):
+        due = self.scheduled
+        self.scheduled = {}
+        for function in due.values():
+            function()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+def test_no_callbacks_left_after_100_games():
+    widget = FakeWidget()
+    clock = FakeClock()
+    ticks = []
+    timer = None
+    for game in range(100):
+        # A new game cancels the previous timer and makes a new one, as the game screen does
+        if timer is not None:
+            timer.cancel()
+        timer = game_timer.GameTimer(widget, ticks.append, clock=clock)
+        timer.start()
+        for _ in range(game % 5):
+            clock.now += 1_000_000_000
+            widget.run_due()
+            assert len(widget.scheduled) == 1
+        clock.now += 123_456
+        # Every third game is left unfinished, so only the next game's cancel() clears it
+        if game % 3:
+            taken = timer.stop()
+            assert taken == (game % 5) + 0.000123456
+            assert widget.scheduled == {}
+    timer.cancel()
+    assert widget.scheduled == {}
+    assert len(ticks) == 100 + sum(game % 5 for game in range(100))
+
+
+def test_stopped_timer_keeps_its_time():
+    widget = FakeWidget()
+    clock = FakeClock()
+    timer = game_timer.GameTimer(widget, lambda seconds: None, clock=clock)
+    timer.start(offset=2.5)
+    clock.now += 1_500_000
+    assert timer.stop() == 2.5015
+    clock.now += 10_000_000_000
+    assert timer.elapsed == 2.5015
+    assert widget.scheduled == {}
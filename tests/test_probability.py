@@ -0,0 +1,27 @@
+# Checks that the hint probabilities refuse boards whose flags cannot all be right
+# Usage: python -m pytest tests
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import engine
+import probability
+
+
+def test_flags_around_a_finished_number_must_match_it():
+    # One row: mine, 1, then hidden cells, with mines further along
+    board = engine.Board(1, 8, 3)
+    board.set_mines([0, 6, 7])
+    board.revealed[1] = 1
+    # The 1 has no hidden neighbors left but two flags next to it
+    board.flagged[0] = 1
+    board.flagged[2] = 1
+    hints = probability.MineProbabilities(board)
+    assert hints.compute() == {}
+
+    # Taking the wrong flag away makes the board possible again
+    board.flagged[2] = 0
+    chances = hints.compute()
+    assert chances[2] == 0.0
+    assert set(chances) == {2, 3, 4, 5, 6, 7}